@@ -5,6 +5,15 @@ import requests
 import streamlit as st
 import threading
 
+from platform_core.firebase_store import FirebaseStore
+
+try:
+    import orjson
+    _ORJSON_OK = True
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore
+    _ORJSON_OK = False
+
 # Module-level cache shared across Streamlit reruns (the server process persists).
 # Streamlit re-runs the whole script on every interaction / st.rerun(), and some
 # pages auto-refresh via `time.sleep(1); st.rerun()` — without this, each rerun would
@@ -17,6 +26,101 @@ except ValueError:
     _LOAD_TTL = 15.0
 
 
+def fast_dumps(data):
+    """Compact UTF-8 JSON bytes — orjson when installed, stdlib json otherwise."""
+    if _ORJSON_OK:
+        # NON_STR_KEYS mirrors stdlib json, which stringifies int dict keys
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def fast_loads(raw):
+    """Parse JSON from bytes/str — orjson when installed, stdlib json otherwise."""
+    if _ORJSON_OK:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+# Dirty check for saves: the bytes of the newest snapshot saved (or loaded from
+# Firebase) by this process, across all sessions. Admin actions that end up changing
+# nothing, and reruns that re-save an untouched document, then skip the local
+# write and the push altogether.
+_SAVED = {"payload": None}
+_SAVED_LOCK = threading.Lock()
+
+
+def claim_save(payload):
+    """Record `payload` as the newest snapshot; False if it is identical to the last one."""
+    with _SAVED_LOCK:
+        if payload == _SAVED["payload"]:
+            return False
+        _SAVED["payload"] = payload
+        return True
+
+
+def forget_saved_payload():
+    """Make the next save write even if unchanged (call when a write or push fails)."""
+    with _SAVED_LOCK:
+        _SAVED["payload"] = None
+
+
+def write_local_file(path, payload):
+    """Atomically replace the JSON file at `path` with `payload` (bytes)."""
+    tmp_file = path + ".tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, path)
+
+
+# Firebase pushes go through platform_core's FirebaseStore write-behind (one per
+# database/local file, shared across reruns and sessions): saves hand it the document
+# and return at once, a burst of saves collapses into one request, and only the rooms
+# that changed since Firebase was last known are PATCHed. Remote loads and manual
+# syncs below rebase it onto what they read or wrote, so rooms this process did not
+# touch are not re-sent. A changed room is still written whole (last writer wins).
+_WRITERS = {}
+_WRITERS_LOCK = threading.Lock()
+
+
+class _AppWriter(FirebaseStore):
+    """FirebaseStore write-behind for the Streamlit app.
+
+    Mirrors to disk with write_local_file (compact, fsync'd, atomic) and voids the
+    save dirty check when a write or push fails.
+    """
+
+    def save(self, data):
+        """Queue `data` for the writer thread, taking ownership of it.
+
+        Callers hand over a fresh copy (save_auction_data parses its payload), so
+        the base class's deep copy into the read cache is skipped; this store only
+        writes, it is never read from.
+        """
+        data = self._ensure_schema(data)
+        self._prune(data)
+        data["_v"] = int(time.time() * 1000)
+        self._queue_remote(data)
+
+    def _write_local(self, data):
+        try:
+            write_local_file(self.local_file_path, fast_dumps(data))
+        except Exception as e:
+            forget_saved_payload()
+            print(f"[Cache] Local save error: {e}")
+
+    def _flush_remote(self, doc):
+        try:
+            pushed = super()._flush_remote(doc)
+        except Exception:
+            forget_saved_payload()
+            raise
+        if not pushed:
+            forget_saved_payload()
+        return pushed
+
+
 class StorageManager:
     """
     Firebase Realtime Database Storage Manager
@@ -50,6 +154,24 @@ class StorageManager:
             self.use_remote = False
             self.db_url = ""
     
+    def _write_local(self, payload):
+        """Atomically replace the local JSON file with `payload` (bytes)."""
+        write_local_file(self.local_file_path, payload)
+
+    @property
+    def writer(self):
+        """The process-wide FirebaseStore write-behind for this database and local file."""
+        key = (self.firebase_url, self.firebase_secret, self.local_file_path)
+        with _WRITERS_LOCK:
+            writer = _WRITERS.get(key)
+            if writer is None:
+                writer = _WRITERS[key] = _AppWriter(
+                    local_file_path=self.local_file_path,
+                    database_url=self.firebase_url,
+                    secret=self.firebase_secret,
+                )
+            return writer
+    
     def _normalize_firebase_data(self, data):
         """
         Firebase converts dicts with numeric-looking keys (like '1', '2') to sparse arrays.
@@ -101,13 +223,14 @@ class StorageManager:
         # 0. Serve the recent in-memory snapshot if fresh (cuts Firebase egress).
         if self.use_remote and _LOAD_CACHE["data"] is not None and \
                 (time.monotonic() - _LOAD_CACHE["ts"]) < _LOAD_TTL:
-            return json.loads(json.dumps(_LOAD_CACHE["data"]))
+            return fast_loads(fast_dumps(_LOAD_CACHE["data"]))
         # 1. Try Firebase (Source of Truth for Cloud)
         if self.use_remote:
             try:
                 response = requests.get(self.db_url, timeout=10)
                 if response.status_code == 200:
-                    data = response.json()
+                    # orjson on the raw ~1 MB body (response.json() always uses stdlib json)
+                    data = fast_loads(response.content)
                     if data is None:
                         data = {}
 
@@ -116,13 +239,15 @@ class StorageManager:
                     data = self._ensure_schema(data)
 
                     # Cache locally
+                    payload = fast_dumps(data)
                     try:
-                        with open(self.local_file_path, 'w') as f:
-                            json.dump(data, f, indent=2)
+                        self._write_local(payload)
                     except: pass
 
-                    _LOAD_CACHE["data"] = json.loads(json.dumps(data))
+                    _LOAD_CACHE["data"] = fast_loads(payload)
                     _LOAD_CACHE["ts"] = time.monotonic()
+                    claim_save(payload)
+                    self.writer.rebase(_LOAD_CACHE["data"])  # never mutated in place
                     return data
             except Exception as e:
                 print(f"Firebase Load Error: {e}")
@@ -130,8 +255,8 @@ class StorageManager:
         # 2. Local Fallback
         if os.path.exists(self.local_file_path):
             try:
-                with open(self.local_file_path, 'r') as f:
-                    data = json.load(f)
+                with open(self.local_file_path, 'rb') as f:
+                    data = fast_loads(f.read())
                     data = self._ensure_schema(data)
                     return data
             except Exception as e:
@@ -147,7 +272,7 @@ class StorageManager:
         try:
             response = requests.get(self.db_url, timeout=10)
             if response.status_code == 200:
-                data = response.json()
+                data = fast_loads(response.content)
                 if data is None:
                     data = {}
                 
@@ -155,13 +280,15 @@ class StorageManager:
                 data = self._ensure_schema(data)
                 
                 # Update local cache
+                payload = fast_dumps(data)
                 try:
-                    with open(self.local_file_path, 'w') as f:
-                        json.dump(data, f, indent=2)
+                    self._write_local(payload)
                 except: pass
 
-                _LOAD_CACHE["data"] = json.loads(json.dumps(data))
+                _LOAD_CACHE["data"] = fast_loads(payload)
                 _LOAD_CACHE["ts"] = time.monotonic()
+                claim_save(payload)
+                self.writer.rebase(_LOAD_CACHE["data"])  # never mutated in place
                 return data
         except Exception as e:
             print(f"Firebase Remote Load Error: {e}")
@@ -171,19 +298,16 @@ class StorageManager:
     
     def save_data(self, data):
         """Save data: Local + Firebase (Synchronous for reliability)."""
+        forget_saved_payload()  # bypasses the async save path, so its dirty check is void
         try:
-            json_str = json.dumps(data, indent=2)
+            json_str = fast_dumps(data)
             
             # 1. Save locally first (fast)
-            tmp_file = self.local_file_path + ".tmp"
-            with open(tmp_file, 'w') as f:
-                f.write(json_str)
-                f.flush()
-                os.fsync(f.fileno())
-            os.rename(tmp_file, self.local_file_path)
+            self._write_local(json_str)
 
             # Write-through the in-memory cache so the next load reflects this save.
-            _LOAD_CACHE["data"] = json.loads(json_str)
+            saved = fast_loads(json_str)
+            _LOAD_CACHE["data"] = saved
             _LOAD_CACHE["ts"] = time.monotonic()
 
             # 2. Save to Firebase (synchronous - MUST succeed for cloud)
@@ -197,6 +321,7 @@ class StorageManager:
                         timeout=15
                     )
                     if response.status_code == 200:
+                        self.writer.rebase(saved)
                         print(f"[StorageManager] Firebase save SUCCESS")
                     else:
                         print(f"[StorageManager] Firebase save FAILED: {response.status_code} - {response.text[:200]}")
@@ -216,8 +341,9 @@ class StorageManager:
         if not self.use_remote:
             return False, "Firebase not configured."
         
+        forget_saved_payload()
         try:
-            json_str = json.dumps(data)
+            json_str = fast_dumps(data)
             response = requests.put(
                 self.db_url,
                 data=json_str,
@@ -225,6 +351,7 @@ class StorageManager:
                 timeout=30
             )
             if response.status_code == 200:
+                self.writer.rebase(fast_loads(json_str))
                 return True, "Successfully synced to Firebase!"
             else:
                 return False, f"Firebase Error: {response.status_code}"
@@ -236,14 +363,16 @@ class StorageManager:
         if not self.use_remote:
             return None, "Firebase not configured."
         
+        forget_saved_payload()
         try:
             response = requests.get(self.db_url, timeout=30)
             if response.status_code == 200:
-                data = response.json() or {}
+                data = fast_loads(response.content) or {}
                 
                 # Save locally
-                with open(self.local_file_path, 'w') as f:
-                    json.dump(data, f, indent=2)
+                payload = fast_dumps(data)
+                self._write_local(payload)
+                self.writer.rebase(fast_loads(payload))
                 
                 return data, "Successfully restored from Firebase!"
             else:
@@ -1,14 +1,30 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 import re
 import json
 import os
+import threading
+
+# lxml (a C parser, listed in requirements.txt) builds the soup several times faster
+# than the pure-Python html.parser on ~200 KB scorecards; the bs4 API stays the same.
+try:
+    import lxml  # noqa: F401
+    _HTML_PARSER = 'lxml'
+except ImportError:  # pragma: no cover - optional dependency
+    _HTML_PARSER = 'html.parser'
+
+# The scorecard page's embedded matchHeader state carries a `complete` flag; the
+# same signal api_server's match-status check treats as authoritative.
+_MATCH_COMPLETE_RE = re.compile(r'matchHeader.*?complete.*?(true|false)')
 
 class CricbuzzScraper:
     def __init__(self):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36'
         }
+        self._local = threading.local()
         # Load player roles from local database for fast lookup
         self.player_roles = {}
         base_dir = os.path.dirname(os.path.abspath(__file__))
@@ -37,6 +53,20 @@ class CricbuzzScraper:
             except:
                 pass
 
+    def _session(self):
+        """Keep-alive requests.Session for the calling thread.
+
+        The app shares one scraper process-wide and fetches scorecards from a thread
+        pool, so each thread gets its own Session (they are not thread-safe).
+        """
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.headers.update(self.headers)
+            # Dropped or refused connections are retried with a short backoff
+            session.mount('https://', HTTPAdapter(max_retries=Retry(total=3, backoff_factor=0.3)))
+        return session
+
     def get_player_role(self, profile_url):
         """
         Fetches the player's role from their Cricbuzz profile page.
@@ -46,10 +76,10 @@ class CricbuzzScraper:
             
         full_url = f"https://www.cricbuzz.com{profile_url}"
         try:
-            response = requests.get(full_url, headers=self.headers)
+            response = self._session().get(full_url)
             if response.status_code != 200: return 'Unknown'
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(response.content, _HTML_PARSER)
             role_label = soup.find(string="Role")
             if role_label:
                 parent = role_label.parent
@@ -66,6 +96,14 @@ class CricbuzzScraper:
         Fetches match data from a Cricbuzz scorecard URL.
         Returns a list of player stats dictionaries.
         """
+        return self.fetch_scorecard(url)[0]
+
+    def fetch_scorecard(self, url):
+        """
+        Like fetch_match_data, but returns (players, completed). `completed` is True
+        only when the page marks the match as complete, so callers can tell a final
+        scorecard from one still in progress.
+        """
         # Ensure we are requesting the scorecard page
         if '/live-cricket-scores/' in url:
              url = url.replace('/live-cricket-scores/', '/live-cricket-scorecard/')
@@ -75,13 +113,15 @@ class CricbuzzScraper:
         print(f"DEBUG: Fetching {url}")
         
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self._session().get(url)
             response.raise_for_status()
         except Exception as e:
             print(f"Error fetching URL: {e}")
-            return []
+            return [], False
 
-        soup = BeautifulSoup(response.content, 'html.parser')
+        status = _MATCH_COMPLETE_RE.search(response.text)
+        completed = bool(status) and status.group(1) == 'true'
+        soup = BeautifulSoup(response.content, _HTML_PARSER)
         
         # === PHASE 1: Build Canonical Player List from Batting+Bowling Grids ===
         # These grids contain full player names with profile links
@@ -434,4 +474,4 @@ class CricbuzzScraper:
                 else:
                     p['role'] = 'Unknown'
                 
-        return list(canonical_players.values())
+        return list(canonical_players.values()), completed
@@ -99,6 +99,9 @@ class FirebaseStore:
         # Firebase currently holds, used to send only the rooms that actually changed.
         self._pending: Optional[dict] = None
         self._last_written: Optional[dict] = None
+        # Bumped by rebase(); a flush that started before a rebase must not put its
+        # (older) document back as the baseline when it completes.
+        self._rebase_gen = 0
         self._writer_lock = threading.Lock()
         self._writer_cv = threading.Condition(self._writer_lock)
         self._writer_started = False
@@ -443,13 +446,16 @@ class FirebaseStore:
                 doc = self._pending
                 self._pending = None
                 self._flushing = True
+                gen = self._rebase_gen
             try:
                 # Local warm-restart file first (fast, never raises), then Firebase.
                 self._write_local(doc)
                 if self._flush_remote(doc):
                     # Only advance the baseline on success, so a failed write is
                     # automatically re-included in the next save's diff.
-                    self._last_written = doc
+                    with self._writer_cv:
+                        if self._rebase_gen == gen:
+                            self._last_written = doc
                 else:  # pragma: no cover - network
                     print("[FirebaseStore] remote save failed")
             except Exception as exc:  # pragma: no cover
@@ -458,6 +464,19 @@ class FirebaseStore:
                 with self._writer_cv:
                     self._flushing = False
 
+    def rebase(self, doc: dict) -> None:
+        """Adopt ``doc`` as what Firebase currently holds.
+
+        For callers that GET or PUT the whole document outside this store (the
+        Streamlit app's StorageManager): the next write-behind then diffs against that
+        copy instead of an older write, and a cold store PATCHes rather than doing a
+        full PUT. This is not conflict detection: a room that differs from ``doc`` is
+        still written whole, so the last writer of a room wins. ``doc`` is kept by
+        reference and must not be mutated afterwards."""
+        with self._writer_cv:
+            self._last_written = doc
+            self._rebase_gen += 1
+
     def flush(self, timeout: float = 5.0) -> None:
         """Block until queued AND in-flight writes are done (for shutdown/tests)."""
         deadline = time.monotonic() + timeout
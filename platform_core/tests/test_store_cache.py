@@ -3,6 +3,7 @@
 import copy
 import json
 import tempfile
+import threading
 import time
 
 import platform_core.firebase_store as fs
@@ -191,6 +192,42 @@ def test_flush_remote_includes_users_when_changed(monkeypatch):
     assert not any(k.startswith("rooms/") for k in body)   # no room changed
 
 
+def test_rebase_makes_next_flush_a_patch_against_the_adopted_doc(monkeypatch):
+    fake = _FakeRequests()
+    s = _remote_store(monkeypatch, fake)
+    remote = {"users": {}, "rooms": {"AB": {"name": "Alpha"}, "CD": {"name": "Beta"}}, "_v": 1}
+    s.rebase(copy.deepcopy(remote))                      # e.g. after an external full GET
+    new = copy.deepcopy(remote)
+    new["rooms"]["CD"]["name"] = "Beta2"
+    fake.calls.clear()
+    assert s._flush_remote(new) is True
+    method, _url, data = fake.calls[-1]
+    assert method == "patch"                             # no full PUT on a cold store
+    body = json.loads(data)
+    assert "rooms/CD" in body and "rooms/AB" not in body
+
+
+def test_rebase_during_inflight_flush_is_not_overwritten(monkeypatch):
+    fake = _FakeRequests()
+    started, release = threading.Event(), threading.Event()
+    put = fake.put
+
+    def slow_put(url, data=None, **kw):
+        started.set()
+        release.wait(2.0)
+        return put(url, data=data, **kw)
+
+    fake.put = slow_put
+    s = _remote_store(monkeypatch, fake)
+    s.save({"users": {}, "rooms": {"AB": {"name": "Alpha"}}})
+    assert started.wait(2.0)                             # PUT in flight
+    remote = {"users": {}, "rooms": {"AB": {"name": "Newer"}}}
+    s.rebase(remote)
+    release.set()
+    s.flush()
+    assert s._last_written is remote                     # older flushed doc didn't win
+
+
 def test_save_write_behind_full_put_then_patch(monkeypatch):
     fake = _FakeRequests()
     s = _remote_store(monkeypatch, fake)
@@ -86,9 +86,27 @@ class CricketScoreCalculator:
         Returns:
             float: The calculated fantasy score (not rounded - caller can decide)
         """
-        total = 0.0
-        role = self.normalize_role(stats.get('role', ''))
+        return self._score(stats, self.normalize_role(stats.get('role', '')))
+    
+    def calculate_scores(self, players):
+        """
+        Scores for a whole scorecard (list of stats dicts), in the same order.
         
+        Equivalent to calling calculate_score on each player, but each distinct
+        role string is normalized only once per batch.
+        """
+        roles = {}
+        scores = []
+        for stats in players:
+            role_str = stats.get('role', '')
+            role = roles.get(role_str)
+            if role is None:
+                role = roles[role_str] = self.normalize_role(role_str)
+            scores.append(self._score(stats, role))
+        return scores
+    
+    def _score(self, stats, role):
+        """Total for an already-normalized role."""
         # Calculate each category
         batting_pts = self._calculate_batting(stats, role)
         bowling_pts = self._calculate_bowling(stats, role)
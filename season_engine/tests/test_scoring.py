@@ -47,3 +47,13 @@ def test_more_runs_scores_higher(calc):
 def test_wickets_add_points(calc):
     base = {"role": "Bowler", "overs_bowled": 4, "runs_conceded": 30}
     assert calc.calculate_score({**base, "wickets": 4}) > calc.calculate_score({**base, "wickets": 1})
+
+
+def test_batch_scores_match_single(calc):
+    players = [
+        {"role": "Batsman", "runs": 50, "balls_faced": 30, "fours": 5, "sixes": 2},
+        {"role": "Bowler", "wickets": 3, "overs_bowled": 4, "maidens": 1, "runs_conceded": 24},
+        {"role": "Batsman", "runs": 0, "balls_faced": 3},
+        {"runs": 12, "balls_faced": 9},
+    ]
+    assert calc.calculate_scores(players) == [calc.calculate_score(p) for p in players]
@@ -1,16 +1,22 @@
 import streamlit as st
+from streamlit.errors import StreamlitAPIException
 import math
 import pandas as pd
 import json
 import os
 import string
+import re
+import difflib
+import traceback
 import random
-import hashlib
+import secrets
 import uuid as uuid_lib
 from datetime import datetime, timedelta
 import sys
 import time
-import requests
+import heapq
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # --- Robust Import Helper ---
 def safe_import_module(module_name):
@@ -38,6 +44,9 @@ except (KeyError, ImportError):
     if 'backend.storage' in sys.modules: del sys.modules['backend.storage']
     import backend.storage
     StorageManager = backend.storage.StorageManager
+# orjson-backed (when installed) JSON helpers shared with the storage layer
+fast_dumps = backend.storage.fast_dumps
+fast_loads = backend.storage.fast_loads
 
 # Force reload scoring modules so Streamlit Cloud always picks up code changes without a reboot
 import importlib
@@ -47,6 +56,8 @@ importlib.reload(whoscored_adapter)
 importlib.reload(football_score_calculator)
 
 import textwrap
+# Salted PBKDF2 shared with the platform API; verify_password still accepts legacy SHA-256
+from platform_core.auth import hash_password, needs_rehash, verify_password
 from ui_theme import inject_premium_theme, hero_header, section_header, status_badge, metric_row, broadcast_header, sidebar_room_info, auction_player_card, timer_bar
 
 # --- Page Config ---
@@ -66,6 +77,52 @@ def get_ist_time():
     """Returns the current time in Indian Standard Time (IST)"""
     return datetime.utcnow() + timedelta(hours=5, minutes=30)
 
+def bid_increment(amount):
+    """Minimum raise over `amount` (10M from 100M, 5M from 50M, else 1M); also the bid input step."""
+    return 10 if amount >= 100 else (5 if amount >= 50 else 1)
+
+def restart_auction_timer(live_auction):
+    """(Re)start the bid timer: epoch seconds for the countdown, ISO copy for display."""
+    live_auction['timer_start_ts'] = time.time()
+    live_auction['timer_start'] = get_ist_time().isoformat()
+
+def auction_timer_elapsed(live_auction):
+    """Seconds since the bid timer started (a float compare on every refresh).
+
+    Auctions saved before timer_start_ts existed fall back to parsing the ISO stamp.
+    """
+    started = live_auction.get('timer_start_ts')
+    if started is not None:
+        return time.time() - started
+    timer_start = datetime.fromisoformat(live_auction.get('timer_start', get_ist_time().isoformat()))
+    return (get_ist_time() - timer_start).total_seconds()
+
+# How long the sold/unsold banner for the previous lot stays up: long enough to
+# outlast the 15s auction_data cache, so other viewers still catch it
+LAST_RESULT_SECONDS = 20
+
+def advance_auction_queue(live_auction):
+    """Put the next queued player up for bidding; returns False once the queue is exhausted.
+
+    player_queue stays fixed for the team and queue_index points at the current lot,
+    so advancing is a counter bump rather than a list remove. Saves from before
+    queue_index existed kept the current lot at the head of the queue, i.e. index 0.
+    """
+    queue = live_auction.get('player_queue', [])
+    idx = live_auction.get('queue_index', 0) + 1
+    live_auction['queue_index'] = idx
+    if idx >= len(queue):
+        live_auction['active'] = False
+        return False
+    next_player = queue[idx]
+    live_auction['current_player'] = next_player
+    live_auction['current_player_role'] = player_role_lookup.get(next_player, 'Unknown')
+    live_auction['current_bid'] = 0
+    live_auction['current_bidder'] = None
+    restart_auction_timer(live_auction)
+    live_auction['opted_out'] = []
+    return True
+
 # Initialize Storage Manager
 storage_mgr = StorageManager(AUCTION_DATA_FILE)
 
@@ -75,10 +132,11 @@ storage_mgr = StorageManager(AUCTION_DATA_FILE)
 # Data is fetched from Firebase only on first load or when explicitly refreshed.
 # Saves update the local cache immediately and push to Firebase in the background.
 
-import threading, time as _time, copy as _copy
+import time as _time, copy as _copy
 
 _CACHE_TTL_SECONDS = 15  # Re-fetch from Firebase if cache is older than this
 
+
 def load_auction_data():
     """Load auction data — uses session_state cache to avoid Firebase on every rerun."""
     now = _time.time()
@@ -107,48 +165,40 @@ def save_auction_data(data):
     st.session_state.auction_data_cache = data
     st.session_state.auction_data_ts = _time.time()
     
-    # 2. Save locally (fast, <10ms)
+    # 2. Serialize once up front (orjson when available): the same bytes go to disk and
+    # to Firebase, so a failed dump never leaves a partial file and the background
+    # push needs no deep copy.
     try:
-        import json as _json
-        tmp_file = storage_mgr.local_file_path + ".tmp"
-        with open(tmp_file, 'w') as f:
-            f.write(_json.dumps(data, indent=2))
-            f.flush()
-            os.fsync(f.fileno())
-        os.rename(tmp_file, storage_mgr.local_file_path)
+        payload = fast_dumps(data)
     except Exception as e:
-        print(f"[Cache] Local save error: {e}")
+        print(f"[Cache] Save serialization error: {e}")
+        return
+    # Byte-identical to the last save (or Firebase load): nothing to write or push
+    if not backend.storage.claim_save(payload):
+        return
     
-    # 3. Push to Firebase in background thread (non-blocking)
+    # 3. With Firebase, FirebaseStore's write-behind mirrors the newest snapshot to disk
+    # and pushes it, so back-to-back saves coalesce and the rerun never waits on the
+    # network; only changed rooms are PATCHed (see backend.storage). It takes ownership
+    # of a parsed copy, since it stamps `_v` and prunes logs in place, which must not
+    # leak into the session's document. Local-only, the file is the source of truth
+    # and is written before returning.
     if storage_mgr.use_remote:
-        def _bg_firebase_save(data_snapshot, db_url):
-            try:
-                import json as _json
-                response = requests.put(
-                    db_url,
-                    data=_json.dumps(data_snapshot),
-                    headers={'Content-Type': 'application/json'},
-                    timeout=15
-                )
-                if response.status_code == 200:
-                    print("[Cache] Firebase async save SUCCESS")
-                else:
-                    print(f"[Cache] Firebase async save FAILED: {response.status_code}")
-            except Exception as e:
-                print(f"[Cache] Firebase async save error: {e}")
-        
-        # Deep-copy to avoid mutation during async write
-        data_snapshot = _copy.deepcopy(data)
-        t = threading.Thread(target=_bg_firebase_save, args=(data_snapshot, storage_mgr.db_url), daemon=True)
-        t.start()
+        storage_mgr.writer.save(fast_loads(payload))
+    else:
+        try:
+            backend.storage.write_local_file(storage_mgr.local_file_path, payload)
+        except Exception as e:
+            backend.storage.forget_saved_payload()
+            print(f"[Cache] Local save error: {e}")
 
 @st.cache_data(ttl=300)
 def load_players_database():
     """Load T20 WC master player database."""
     if os.path.exists(PLAYERS_DB_FILE):
         try:
-            with open(PLAYERS_DB_FILE, 'r') as f:
-                data = json.load(f)
+            with open(PLAYERS_DB_FILE, 'rb') as f:
+                data = fast_loads(f.read())
                 return data.get("players", [])
         except:
             pass
@@ -159,8 +209,8 @@ def load_ipl_database():
     """Load IPL 2026 player database."""
     if os.path.exists(IPL_SQUADS_FILE):
         try:
-            with open(IPL_SQUADS_FILE, 'r') as f:
-                data = json.load(f)
+            with open(IPL_SQUADS_FILE, 'rb') as f:
+                data = fast_loads(f.read())
                 teams = data.get("teams", {})
                 players = []
                 for team_code, team_data in teams.items():
@@ -177,8 +227,8 @@ def load_fifa_database():
     """Load FIFA World Cup 2026 player database."""
     if os.path.exists(FIFA_WC_PLAYERS_FILE):
         try:
-            with open(FIFA_WC_PLAYERS_FILE, 'r') as f:
-                return json.load(f)
+            with open(FIFA_WC_PLAYERS_FILE, 'rb') as f:
+                return fast_loads(f.read())
         except:
             pass
     return []
@@ -190,15 +240,14 @@ def get_tournament_players(tournament_type):
         return load_fifa_database()
     return load_players_database()
 
+ROOM_CODE_ALPHABET = string.ascii_uppercase + string.digits
+
 def generate_room_code():
-    """Generate a unique 6-character room code."""
-    return ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
+    """Generate a 6-character room code (callers still retry on a clash)."""
+    return ''.join(secrets.choice(ROOM_CODE_ALPHABET) for _ in range(6))
 
-def hash_password(password):
-    """Hash password using SHA256."""
-    return hashlib.sha256(password.encode()).hexdigest()
 
-@st.cache_data(ttl=300)
+@st.cache_data(ttl=3600)
 def load_schedule(tournament_type="T20 World Cup"):
     """Load tournament schedule."""
     if tournament_type == "IPL 2026":
@@ -209,12 +258,37 @@ def load_schedule(tournament_type="T20 World Cup"):
         file_path = SCHEDULE_FILE
     if os.path.exists(file_path):
         try:
-            with open(file_path, 'r') as f:
-                return json.load(f)
+            with open(file_path, 'rb') as f:
+                return fast_loads(f.read())
         except:
             pass
     return {"gameweeks": {}}
 
+def with_categories(df, cols):
+    """Store repetitive text columns as pandas Categoricals (dictionary-encoded in Arrow)."""
+    for col in cols:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
+
+@st.cache_data(ttl=3600)
+def load_gameweek_matches_df(tournament_type, gw_key):
+    """Display table of one gameweek's fixtures (schedule files are static, so cache per GW)."""
+    gw_data = load_schedule(tournament_type).get('gameweeks', {}).get(gw_key, {})
+    matches = gw_data.get('matches', [])
+    if not matches:
+        return pd.DataFrame()
+    display_cols = ['match_id', 'Match', 'date']
+    if any('time' in m for m in matches):
+        display_cols.append('time')
+    display_cols.append('venue')
+    # Rows built directly: no full-schedule frame, column apply, or column-subset copy
+    rows = [
+        {**m, 'Match': f"{m['teams'][0]} vs {m['teams'][1]}"}
+        for m in matches
+    ]
+    return with_categories(pd.DataFrame.from_records(rows, columns=display_cols), ('date', 'venue'))
+
 # --- Session State Initialization ---
 if 'logged_in_user' not in st.session_state:
     st.session_state.logged_in_user = None
@@ -229,25 +303,210 @@ active_tournament_type = "T20 World Cup"
 if st.session_state.current_room and st.session_state.current_room in auction_data.get('rooms', {}):
     active_tournament_type = auction_data['rooms'][st.session_state.current_room].get('tournament_type', 'T20 World Cup')
 
-players_db = get_tournament_players(active_tournament_type)
-
-# Create lookup dict for quick role finding
-player_role_lookup = {p['name']: p.get('role', 'Unknown') for p in players_db}
-player_team_lookup = {p['name']: p.get('country', 'Unknown') for p in players_db}
-player_info_map = {p['name']: p for p in players_db}
-player_names = [p['name'] for p in players_db]
+@st.cache_resource(ttl=300, max_entries=8)
+def load_player_indexes(tournament_type):
+    """Player list plus its lookup tables, built once per process per tournament.
+
+    Shared by every session (no per-rerun copy), so treat the results as read-only.
+    """
+    pdb = get_tournament_players(tournament_type)
+    # Create lookup dict for quick role finding
+    role_lookup = {p['name']: p.get('role', 'Unknown') for p in pdb}
+    team_lookup = {p['name']: p.get('country', 'Unknown') for p in pdb}
+    info_map = {p['name']: p for p in pdb}
+    names = [p['name'] for p in pdb]
+    return pdb, role_lookup, team_lookup, info_map, names
+
+players_db, player_role_lookup, player_team_lookup, player_info_map, player_names = \
+    load_player_indexes(active_tournament_type)
+
+@st.cache_resource(ttl=300, max_entries=8)
+def load_players_by_team(tournament_type):
+    """{team: [player, ...]} in database order; shared and read-only like load_player_indexes."""
+    teams = {}
+    for player in load_player_indexes(tournament_type)[0]:
+        teams.setdefault(player.get('country', 'Unknown'), []).append(player)
+    return teams
+
+# Live auction order: batsmen -> allrounders -> bowlers, unknown roles last
+AUCTION_ROLE_ORDER = {'WK-Batsman': 0, 'Batsman': 1, 'Batting Allrounder': 2, 'Bowling Allrounder': 3, 'Bowler': 4}
+
+@st.cache_resource(ttl=300, max_entries=8)
+def load_auction_order_by_team(tournament_type):
+    """load_players_by_team with each team pre-sorted into live auction order (stable)."""
+    return {
+        team: sorted(players, key=lambda x: AUCTION_ROLE_ORDER.get(x.get('role', 'Unknown'), 99))
+        for team, players in load_players_by_team(tournament_type).items()
+    }
 
 def format_player_name(name):
     if not name: return "Select a player..."
     info = player_info_map.get(name, {})
     return f"{name} ({info.get('role', 'N/A')} - {info.get('country', 'N/A')})"
 
+def new_trade_proposal(from_name, to_name, trade_type, **fields):
+    """Pending-trade record with a fresh id and IST creation timestamp."""
+    return {
+        'id': str(uuid_lib.uuid4()), 'from': from_name, 'to': to_name, 'type': trade_type,
+        **fields,
+        'created_at': get_ist_time().isoformat()
+    }
+
+def trade_players_label(trade):
+    """Players involved in a pending trade, e.g. "A, B ↔ C" for exchanges."""
+    if trade['type'] == 'Exchange':
+        give_list = trade.get('give_players', [trade.get('give_player')] if trade.get('give_player') else [])
+        return f"{', '.join(give_list)} ↔ {trade.get('get_player')}"
+    return trade.get('player') or f"{trade.get('give_player')} <-> {trade.get('get_player')}"
+
+# Teams offered in the admin "Manage Knocked-Out Teams" picker, per tournament
+TOURNAMENT_TEAMS = {
+    'IPL 2026': ("CSK", "DC", "GT", "KKR", "LSG", "MI", "PBKS", "RCB", "RR", "SRH"),
+    'FIFA World Cup 2026': ("Mexico", "South Africa", "Korea Republic", "Czechia",
+                            "Canada", "Bosnia and Herzegovina", "Qatar", "Switzerland",
+                            "Brazil", "Morocco", "Haiti", "Scotland",
+                            "United States", "Paraguay", "Australia", "Türkiye",
+                            "Germany", "Curaçao", "Côte d'Ivoire", "Ecuador",
+                            "Netherlands", "Japan", "Sweden", "Tunisia",
+                            "Belgium", "Egypt", "Iran", "New Zealand",
+                            "Spain", "Cape Verde", "Saudi Arabia", "Uruguay",
+                            "France", "Senegal", "Iraq", "Norway"),
+    'T20 World Cup': ("India", "Sri Lanka", "Australia", "England", "South Africa", "New Zealand",
+                      "Pakistan", "West Indies", "Afghanistan", "USA", "Ireland",
+                      "Scotland", "Netherlands", "Zimbabwe", "Namibia", "Nepal",
+                      "Oman", "UAE", "Canada", "Italy"),
+}
+
+# Global Transaction Log only renders this many of the newest entries
+TRADE_LOG_DISPLAY_LIMIT = 100
+
+# Dropdowns longer than this get a filter box and only render the first matches
+LARGE_OPTIONS_THRESHOLD = 200
+FILTERED_OPTIONS_LIMIT = 50
+
+def filtered_options(options, label, key):
+    """Return `options` unchanged when short, else a text-filtered slice of at most 50 entries."""
+    if len(options) <= LARGE_OPTIONS_THRESHOLD:
+        return options
+    q = st.text_input(f"Filter {label}", key=f"{key}_filter", placeholder="Type to narrow the list...").strip().lower()
+    matches = [o for o in options if q in o.lower()] if q else options
+    if len(matches) > FILTERED_OPTIONS_LIMIT:
+        st.caption(f"Showing first {FILTERED_OPTIONS_LIMIT} of {len(matches)} matches — refine the filter to see more.")
+    return matches[:FILTERED_OPTIONS_LIMIT]
+
+# =========================================================
+# Cricbuzz Gameweek Scoring (shared by Process Gameweek + Manual URLs)
+# =========================================================
+SCRAPE_MAX_WORKERS = 8
+
+def parse_match_urls(text):
+    """Non-blank lines of a pasted URL list, stripped, first occurrence of each kept.
+
+    A scorecard pasted twice would otherwise be fetched and scored twice.
+    """
+    return list(dict.fromkeys(u for u in map(str.strip, text.split('\n')) if u))
+
+@st.cache_resource
+def get_cricbuzz_scraper():
+    """Process-wide scraper: its constructor reads the player-role databases from disk.
+
+    Stateless after __init__, so one instance is safely shared by sessions and threads.
+    """
+    return cricbuzz_scraper.CricbuzzScraper()
+
+@st.cache_resource
+def get_cricket_calculator():
+    """Process-wide CricketScoreCalculator (stateless)."""
+    return CricketScoreCalculator()
+
+class _MatchInProgress(Exception):
+    """Carries the scores of a scorecard that isn't final out of the cached scorer."""
+    def __init__(self, scores):
+        super().__init__("match not complete")
+        self.scores = scores
+
+@st.cache_data(ttl=12 * 3600, max_entries=256, show_spinner=False)
+def _score_finished_match(url, _scraper, _calculator):
+    # Only completed matches are cached: anything raised here (empty scrapes, or a
+    # match still in progress) is not stored, so the next run scrapes it again.
+    players, completed = _scraper.fetch_scorecard(url)
+    if not players:
+        raise ValueError("no player data found on scorecard")
+    match_scores = Counter()
+    for p, score in zip(players, _calculator.calculate_scores(players)):
+        match_scores[p['name']] += score
+    if not completed:
+        raise _MatchInProgress(match_scores)
+    return match_scores
+
+def score_cricbuzz_match(url, scraper, calculator):
+    """{player_name: points} for one scorecard URL.
+
+    Completed scorecards are cached per URL, so re-processing a gameweek (e.g. after
+    adding a late match) only scrapes the new URLs; a match that was still in
+    progress is scraped afresh every time. "Reset All Gameweek Scores" clears the cache.
+    """
+    try:
+        return _score_finished_match(url, scraper, calculator)
+    except _MatchInProgress as e:
+        return e.scores
+
+def score_cricbuzz_urls(urls, scraper, calculator, progress, status):
+    """Fetch scorecards concurrently and return {player_name: total_points} across all URLs."""
+    # update() rather than `+`: Counter addition would drop zero/negative scores
+    all_scores = Counter()
+    with ThreadPoolExecutor(max_workers=min(SCRAPE_MAX_WORKERS, len(urls))) as ex:
+        futures = {ex.submit(score_cricbuzz_match, u, scraper, calculator): u for u in urls}
+        # Streamlit calls stay on this thread; fetching and scoring run in the pool
+        for i, fut in enumerate(as_completed(futures)):
+            url = futures[fut]
+            status.text(f"Processed match {i+1}/{len(urls)}...")
+            try:
+                all_scores.update(fut.result())
+            except Exception as e:
+                st.warning(f"Error processing {url}: {e}")
+            progress.progress((i + 1) / len(urls))
+    return dict(all_scores)
+
 # =========================================================
 # Best-11 Calculator (shared across Standings + Knockout)
 # =========================================================
+# Best-11 (min, max) picks per position. Cricket GWs 1-10 used the older AR/BWL split.
+FOOTBALL_ROLE_RANGES = {'GK': (1, 1), 'DEF': (3, 5), 'MID': (3, 5), 'FWD': (1, 3)}
+CRICKET_ROLE_RANGES_EARLY = {'WK': (1, 3), 'BAT': (1, 4), 'AR': (3, 6), 'BWL': (2, 4)}
+CRICKET_ROLE_RANGES = {'WK': (1, 3), 'BAT': (1, 4), 'AR': (2, 6), 'BWL': (3, 4)}
+
+def _freeze_score(entry):
+    # Dual-position scores are dicts; freeze them so they can key the cache
+    return tuple(entry.items()) if isinstance(entry, dict) else entry
+
+@st.cache_data(show_spinner=False, max_entries=1024)
+def _best_11_cached(squad_key, ir_player, gameweek, tournament_type):
+    # tournament_type only keys the cache (role rules read active_tournament_type)
+    squad = [{'name': name, 'role': role} for name, role, _ in squad_key]
+    scores = {name: dict(score) if isinstance(score, tuple) else score for name, _, score in squad_key}
+    return _compute_best_11(squad, scores, ir_player, gameweek)
+
 def get_best_11(squad, player_scores, ir_player=None, gameweek=None):
-    import itertools
-    
+    """Best valid XI for `squad` under `player_scores` -> (team, warnings).
+
+    Memoized with st.cache_data on each member's (name, role, score), so the
+    standings table, the detail view and the knockout preview share one computation
+    per squad/GW, and reruns that don't change squads or scores skip it entirely.
+    """
+    # Built on every call (the cache hit path), so the score lookup is bound once
+    get_score = player_scores.get
+    squad_key = tuple(
+        (p['name'], p.get('role', ''), _freeze_score(get_score(p['name'], 0)))
+        for p in squad
+    )
+    try:
+        # cache_data hands back a fresh copy, so callers may annotate the rows
+        return _best_11_cached(squad_key, ir_player, gameweek, active_tournament_type)
+    except (TypeError, StreamlitAPIException):  # unhashable score/role value: compute directly
+        return _compute_best_11(squad, player_scores, ir_player, gameweek)
+
+def _compute_best_11(squad, player_scores, ir_player=None, gameweek=None):
     # IMPORTANT: IR only applies if squad >= 19 players
     # If squad is smaller, ignore IR and count all players
     if len(squad) < 19:
@@ -259,8 +518,9 @@ def get_best_11(squad, player_scores, ir_player=None, gameweek=None):
     is_football = active_tournament_type == 'FIFA World Cup 2026'
     
     scored_players = []
+    get_score = player_scores.get
     for p in active_squad: 
-        score_entry = player_scores.get(p['name'], 0)
+        score_entry = get_score(p['name'], 0)
         
         if isinstance(score_entry, dict):
             # Dual position player
@@ -309,16 +569,8 @@ def get_best_11(squad, player_scores, ir_player=None, gameweek=None):
                 collapsed_players[name] = p
         return list(collapsed_players.values()), []
     
-    # Brute force 11 from N
-    scored_players.sort(key=lambda x: x['score'], reverse=True)
-    
     if is_football:
-        valid_ranges = {
-            'GK': (1, 1),
-            'DEF': (3, 5),
-            'MID': (3, 5),
-            'FWD': (1, 3)
-        }
+        valid_ranges = FOOTBALL_ROLE_RANGES
     else:
         # Determine rules based on gameweek
         use_old_rule = False
@@ -330,20 +582,7 @@ def get_best_11(squad, player_scores, ir_player=None, gameweek=None):
             except (ValueError, TypeError):
                 pass
         
-        if use_old_rule:
-            valid_ranges = {
-                'WK': (1, 3),
-                'BAT': (1, 4),
-                'AR': (3, 6),
-                'BWL': (2, 4)
-            }
-        else:
-            valid_ranges = {
-                'WK': (1, 3),
-                'BAT': (1, 4),
-                'AR': (2, 6),
-                'BWL': (3, 4)
-            }
+        valid_ranges = CRICKET_ROLE_RANGES_EARLY if use_old_rule else CRICKET_ROLE_RANGES
     
     # DP logic for fast optimal team selection
     players_by_name = {}
@@ -353,47 +592,58 @@ def get_best_11(squad, player_scores, ir_player=None, gameweek=None):
             players_by_name[n] = {'name': n, 'options': []}
         players_by_name[n]['options'].append(p)
 
+    # Only each player's own options need ordering (best position first); the pool
+    # itself is ordered once below, so no full sort of scored_players is needed.
+    for entry in players_by_name.values():
+        entry['options'].sort(key=lambda x: x['score'], reverse=True)
+
     unique_players = list(players_by_name.values())
     unique_players.sort(key=lambda x: max(opt['score'] for opt in x['options']), reverse=True)
 
+    # Fast path: if the 11 top scorers (each at their best position) already satisfy
+    # the role ranges, no constrained selection can beat them — skip the DP.
+    top_picks = [entry['options'][0] for entry in unique_players[:11]]
+    if len(top_picks) == 11:
+        top_counts = Counter(opt['category'] for opt in top_picks)
+        if all(min_v <= top_counts[k] <= max_v for k, (min_v, max_v) in valid_ranges.items()) \
+                and sum(top_counts[k] for k in valid_ranges) == 11:
+            return top_picks, []
+
     role_keys = list(valid_ranges.keys())
     role_idx = {k: i for i, k in enumerate(role_keys)}
+    role_min = tuple(valid_ranges[k][0] for k in role_keys)
+    role_max = tuple(valid_ranges[k][1] for k in role_keys)
+    # Resolve each option's role slot once instead of on every DP visit
+    slot_options = [
+        [(role_idx[opt['category']], opt) for opt in entry['options'] if opt['category'] in role_idx]
+        for entry in unique_players
+    ]
+    n_players = len(unique_players)
+    neg_inf = -float('inf')
     memo = {}
 
-    def dp(idx, counts):
-        picked = sum(counts)
+    def dp(idx, counts, picked):
         if picked == 11:
-            valid = True
-            for i, k in enumerate(role_keys):
-                min_v, max_v = valid_ranges[k]
-                if not (min_v <= counts[i] <= max_v):
-                    valid = False
-                    break
-            return (0, []) if valid else (-float('inf'), [])
+            valid = all(lo <= c <= hi for lo, c, hi in zip(role_min, counts, role_max))
+            return (0, []) if valid else (neg_inf, [])
 
-        if idx == len(unique_players):
-            return (-float('inf'), [])
+        # Not enough players left to reach 11
+        if n_players - idx < 11 - picked:
+            return (neg_inf, [])
 
         state = (idx, counts)
         if state in memo:
             return memo[state]
 
-        best_score, best_team = dp(idx + 1, counts)
+        best_score, best_team = dp(idx + 1, counts, picked)
 
-        for opt in unique_players[idx]['options']:
-            cat = opt['category']
-            if cat not in role_idx:
-                continue
-            r_i = role_idx[cat]
-            
-            new_counts = list(counts)
-            new_counts[r_i] += 1
-            
-            if new_counts[r_i] > valid_ranges[role_keys[r_i]][1]:
+        for r_i, opt in slot_options[idx]:
+            if counts[r_i] >= role_max[r_i]:
                 continue
+            new_counts = counts[:r_i] + (counts[r_i] + 1,) + counts[r_i + 1:]
 
-            score, team = dp(idx + 1, tuple(new_counts))
-            if score != -float('inf'):
+            score, team = dp(idx + 1, new_counts, picked + 1)
+            if score != neg_inf:
                 total_score = score + opt['score']
                 if total_score > best_score:
                     best_score = total_score
@@ -402,7 +652,7 @@ def get_best_11(squad, player_scores, ir_player=None, gameweek=None):
         memo[state] = (best_score, best_team)
         return memo[state]
 
-    best_score, best_team = dp(0, tuple([0] * len(role_keys)))
+    best_score, best_team = dp(0, tuple([0] * len(role_keys)), 0)
     if best_score != -float('inf') and best_team:
         return best_team, []
     else:
@@ -418,25 +668,19 @@ def get_best_11(squad, player_scores, ir_player=None, gameweek=None):
                 collapsed_players[name] = p
         collapsed_pool = list(collapsed_players.values())
         
-        # Group available players by category, sorted by score desc
+        # Group available players by category (names are unique after collapsing)
         by_cat = {k: [] for k in valid_ranges}
         for p in collapsed_pool:
             if p['category'] in by_cat:
                 by_cat[p['category']].append(p)
-
-        for cat in by_cat:
-            by_cat[cat].sort(key=lambda x: x['score'], reverse=True)
         
         greedy_team = []
         used_names = set()
         
-        # Step 1: Fill each role's minimum quota
+        # Step 1: Fill each role's minimum quota with its top scorers
         for role, (min_v, _) in valid_ranges.items():
-            available = [p for p in by_cat[role] if p['name'] not in used_names]
             filled = 0
-            for p in available:
-                if filled >= min_v:
-                    break
+            for p in heapq.nlargest(min_v, by_cat[role], key=lambda x: x['score']):
                 greedy_team.append(p)
                 used_names.add(p['name'])
                 filled += 1
@@ -449,8 +693,7 @@ def get_best_11(squad, player_scores, ir_player=None, gameweek=None):
         remaining_slots = 11 - len(greedy_team)
         if remaining_slots > 0:
             unused = [p for p in scored_players if p['name'] not in used_names]
-            unused.sort(key=lambda x: x['score'], reverse=True)
-            for p in unused[:remaining_slots]:
+            for p in heapq.nlargest(remaining_slots, unused, key=lambda x: x['score']):
                 # Check we don't exceed the max for this category
                 cat_count = sum(1 for t in greedy_team if t['category'] == p['category'])
                 _, max_v = valid_ranges.get(p['category'], (0, 99))
@@ -463,7 +706,199 @@ def get_best_11(squad, player_scores, ir_player=None, gameweek=None):
         return greedy_team[:11], warnings
 
 
+# =========================================================
+# Cumulative Standings (shared across Standings + Knockout)
+# =========================================================
+def _str_keys(obj):
+    """Copy of `obj` with every dict key as str, the form a JSON reload gives them."""
+    if isinstance(obj, dict):
+        return {str(k): _str_keys(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_str_keys(v) for v in obj]
+    return obj
+
+def _cache_key_json(obj):
+    """Sorted-key JSON of `obj` for use as an st.cache_data argument.
+
+    Gameweek keys are ints on some paths and strs after a reload; a dict mixing
+    both can't be key-sorted, so those are normalised to str first.
+    """
+    try:
+        return json.dumps(obj, sort_keys=True)
+    except TypeError:
+        return json.dumps(_str_keys(obj), sort_keys=True)
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _cumulative_totals_cached(gameweek_scores_json, gameweek_squads_json, hattrick_json, participants_json, tournament_type):
+    # JSON-string arguments keep the cache key a cheap content hash; tournament_type
+    # only keys the cache (get_best_11 reads the module-level role rules).
+    gameweek_scores = json.loads(gameweek_scores_json)
+    gameweek_squads = json.loads(gameweek_squads_json)
+    hattrick_bonuses = json.loads(hattrick_json)
+    participants = json.loads(participants_json)
+
+    p_totals = {p['name']: 0 for p in participants}
+    for gw, scores in gameweek_scores.items():
+        scores_with_bonus = scores.copy()
+        for player, bonus in hattrick_bonuses.get(str(gw), {}).items():
+            scores_with_bonus[player] = scores_with_bonus.get(player, 0) + bonus
+
+        locked_squads = gameweek_squads.get(str(gw), {})
+        for participant in participants:
+            p_name = participant['name']
+            # Squad locked for THIS gameweek; fall back to the current squad if no snapshot
+            squad_data = locked_squads.get(p_name)
+            if squad_data:
+                if isinstance(squad_data, list):
+                    squad = squad_data
+                    ir_player = None
+                else:
+                    squad = squad_data.get('squad', [])
+                    ir_player = squad_data.get('injury_reserve')
+            else:
+                squad = participant['squad']
+                ir_player = participant.get('injury_reserve')
+
+            best_11, _ = get_best_11(squad, scores_with_bonus, ir_player, gameweek=gw)
+            p_totals[p_name] += sum(p_entry['score'] for p_entry in best_11)
+    return p_totals
+
+def cumulative_totals(room, participants):
+    """{participant_name: total} summing each GW's best 11 from that GW's locked squad.
+
+    Cached on the room's scores, snapshots, bonuses and the given participants'
+    squads, so reruns that change none of them skip every best-11 computation.
+    """
+    slim_participants = [
+        {'name': p['name'], 'squad': p.get('squad', []), 'injury_reserve': p.get('injury_reserve')}
+        for p in participants
+    ]
+    return _cumulative_totals_cached(
+        _cache_key_json(room.get('gameweek_scores', {})),
+        _cache_key_json(room.get('gameweek_squads', {})),
+        _cache_key_json(room.get('hattrick_bonuses', {})),
+        _cache_key_json(slim_participants),
+        active_tournament_type,
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _player_season_totals_cached(gameweek_scores_json, hattrick_json):
+    gameweek_scores = json.loads(gameweek_scores_json)
+    hattrick = json.loads(hattrick_json)
+    player_totals = {}
+    for gw, scores in gameweek_scores.items():
+        hattrick_bonuses = hattrick.get(str(gw), {})
+        for player, score in scores.items():
+            total = score + hattrick_bonuses.get(player, 0)
+            entry = player_totals.get(player)
+            if entry is None:
+                entry = player_totals[player] = {'score': 0, 'matches': 0, 'gw_scores': {}}
+            entry['score'] += total
+            entry['matches'] += 1
+            entry['gw_scores'][gw] = total
+    return player_totals
+
+def player_season_totals(room):
+    """{player: {'score', 'matches', 'gw_scores'}} over every processed GW, hat-tricks included.
+
+    Keys keep the room's GW order (no sort_keys) so tie order in the leaderboard is unchanged.
+    """
+    return _player_season_totals_cached(
+        json.dumps(room.get('gameweek_scores', {})),
+        json.dumps(room.get('hattrick_bonuses', {})),
+    )
+
+def participant_index(room):
+    """({name: participant}, {user: participant}) for the room as loaded this rerun.
+
+    First match wins, like the `next(...)` scans it replaces. Rebuilt per render on
+    purpose: auction_data is reloaded each rerun, so a cross-rerun cache would hand
+    back stale participant dicts whose mutations never reach the saved document.
+    """
+    by_name, by_user = {}, {}
+    for p in room.get('participants', []):
+        by_name.setdefault(p['name'], p)
+        by_user.setdefault(p.get('user'), p)
+    return by_name, by_user
+
+
+def drafted_player_names(room):
+    """Set of every player name currently in a squad in the room (per render, like participant_index)."""
+    return {pl['name'] for p in room.get('participants', []) for pl in p['squad']}
+
+
+def drop_from_squad(participant, *entries):
+    """Remove these exact squad entry dicts, in one identity-based pass (no dict __eq__)."""
+    ids = {id(entry) for entry in entries}
+    participant['squad'][:] = [pl for pl in participant['squad'] if id(pl) not in ids]
+
+
+def used_paid_release(participant, gameweek):
+    """Whether the participant already used this gameweek's paid release.
+
+    paid_releases is keyed by gameweek, but Firebase turns int-like keys into a list.
+    """
+    paid_releases = participant.get('paid_releases', {})
+    if isinstance(paid_releases, list):
+        return bool(gameweek < len(paid_releases) and paid_releases[gameweek])
+    return paid_releases.get(str(gameweek), False) if gameweek > 0 else False
+
+
+def bid_expires_ts(bid):
+    """Bid expiry as a timestamp; bids placed before `expires_ts` existed fall back to the ISO string."""
+    ts = bid.get('expires_ts')
+    return ts if ts is not None else datetime.fromisoformat(bid['expires']).timestamp()
+
+
+def award_expired_bids(room, participants_by_name, now, global_deadline):
+    """Award every open bid whose timer (or the global deadline) has run out.
+
+    Mutates the room in place and returns the awarded bids; the caller saves. Runs
+    on the render path because each session works on its own copy of auction_data
+    and saves it whole, so a separate background awarder would race those saves.
+    """
+    deadline_passed = global_deadline is not None and now >= global_deadline
+    now_ts = now.timestamp()
+
+    # Single pass: each bid is either awarded or kept (not yet due, or unaffordable)
+    awarded_bids, still_active = [], []
+    for bid in room.get('active_bids', []):
+        bidder_participant = participants_by_name.get(bid['bidder'])
+        if not (deadline_passed or now_ts >= bid_expires_ts(bid)) or \
+                not bidder_participant or bid['amount'] > bidder_participant.get('budget', 0):
+            still_active.append(bid)
+            continue
+
+        # Award the player to the bidder
+        bidder_participant['squad'].append({
+            'name': bid['player'],
+            'role': player_role_lookup.get(bid['player'], 'Unknown'),
+            'team': player_team_lookup.get(bid['player'], 'Unknown'),
+            'buy_price': bid['amount']
+        })
+        bidder_participant['budget'] -= bid['amount']
+        awarded_bids.append(bid)
+
+        # === LOGGING ===
+        timestamp = get_ist_time().strftime('%d-%b %H:%M')
+        log_msg = f"🔨 Won Bid: **{bid['player']}** won by **{bid['bidder']}** for **{bid['amount']}M**"
+        room.setdefault('trade_log', []).append({"time": timestamp, "msg": log_msg})
+
+    # Most reruns have nothing due: leave the room untouched then
+    if awarded_bids:
+        awarded_players = {bid['player'] for bid in awarded_bids}
+        if 'unsold_players' in room:
+            room['unsold_players'] = [n for n in room['unsold_players'] if n not in awarded_players]
+        room['active_bids'] = still_active
+    return awarded_bids
+
+
 def inject_custom_css():
+    # Deliberately not gated on session_state: Streamlit drops any element a rerun
+    # doesn't re-emit, so skipping this after the first run would strip the theme.
+    # The CSS string itself is built once per process (ui_theme cache_resource), and
+    # fragment refreshes (live auction) don't re-run the page, so they don't re-send it.
     inject_premium_theme()
 
 
@@ -491,7 +926,11 @@ def show_login_page():
                     if login_username in auction_data['users']:
                         user_data = auction_data['users'][login_username]
                         stored_hash = user_data.get('password_hash', '')
-                        if stored_hash and hash_password(login_password) == stored_hash:
+                        if verify_password(stored_hash, login_password):
+                            if needs_rehash(stored_hash):
+                                # Migrate legacy unsalted hashes on the next good login
+                                user_data['password_hash'] = hash_password(login_password)
+                                save_auction_data(auction_data)
                             st.session_state.logged_in_user = login_username
                             st.success(f"Welcome back, {login_username}!")
                             st.rerun()
@@ -658,7 +1097,7 @@ def show_room_selection():
     st.subheader("📋 Your Rooms")
     
     user_rooms = user_data.get('rooms_created', []) + user_data.get('rooms_joined', [])
-    user_rooms = list(set(user_rooms))  # Remove duplicates
+    user_rooms = list(dict.fromkeys(user_rooms))  # Remove duplicates, keep created-then-joined order
     
     if user_rooms:
         room_data = []
@@ -687,6 +1126,132 @@ def show_room_selection():
     else:
         st.info("You haven't created or joined any rooms yet.")
 
+@st.cache_data(show_spinner=False, max_entries=64)
+def squad_manifest_df(squad, with_team=False):
+    """Player/Role[/Team]/Price table for the live auction dashboards, built column-wise.
+
+    Cached on the squad's content: the auction fragment redraws every few seconds
+    while a squad only changes on a sale, so most redraws reuse the built frame.
+    """
+    columns = {
+        "Player": [pl['name'] for pl in squad],
+        "Role": [pl.get('role', 'Unknown') for pl in squad],
+    }
+    if with_team:
+        columns["Team"] = [pl.get('team', 'Unknown') for pl in squad]
+    columns["Price"] = [f"{pl['buy_price']}M" for pl in squad]
+    return pd.DataFrame(columns)
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def reference_squad_df(rows):
+    """Player/Role/Status table for a real-world squad from (name, role, taken) rows.
+
+    Cached like squad_manifest_df: the rows only change when a player is sold.
+    """
+    return pd.DataFrame({
+        "Player": [name for name, _, _ in rows],
+        "Role": [role for _, role, _ in rows],
+        "Status": ["🔴 Taken" if taken else "🟢 Available" for _, _, taken in rows],
+    })
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def team_stats_df(teams, tournament_type):
+    """Sidebar "All Team Stats & Budgets" table from (name, budget, squad names) rows.
+
+    Cached on that signature, which only changes on a buy/release/budget edit, so
+    ordinary reruns skip the per-player role counting.
+    """
+    role_lookup = load_player_indexes(tournament_type)[1]
+    stats_data = []
+    for name, budget, squad_names in teams:
+        roles = Counter(role_lookup.get(pl_name) for pl_name in squad_names)
+        stats_data.append({
+            "Team": name,
+            "Plyrs": len(squad_names),
+            "Bat": roles['Batsman'],
+            "Bowl": roles['Bowler'],
+            "AR": roles['Batting Allrounder'] + roles['Bowling Allrounder'],
+            "WK": roles['WK-Batsman'],
+            "Budget": f"{budget}M"
+        })
+    return pd.DataFrame(stats_data)
+
+@st.cache_data(show_spinner=False, ttl=600, max_entries=32)
+def squad_dashboard_df(rows):
+    """Squad Dashboard table from (participant, player, role, team, price) rows.
+
+    Cached on the rows, so reruns with unchanged squads skip the frame build; the
+    participant/search filters are applied to the returned copy, outside the cache.
+    """
+    return with_categories(
+        pd.DataFrame.from_records(rows, columns=['Participant', 'Player', 'Role', 'Team', 'Price']),
+        ('Participant', 'Role', 'Team'),
+    )
+
+def render_squad_manifest_picker(room, participants_by_name, label, placeholder, key, empty_msg,
+                                 with_team=False, label_visibility="visible", use_container_width=None):
+    """Participant selectbox + squad table shared by the auction lobby and live dashboard."""
+    p_options = [placeholder] + [p['name'] for p in room.get('participants', [])]
+    selected_p_view = st.selectbox(label, p_options, label_visibility=label_visibility, key=key)
+    if selected_p_view == placeholder:
+        return
+    p_data = participants_by_name.get(selected_p_view)
+    if p_data and p_data['squad']:
+        table_kwargs = {} if use_container_width is None else {'use_container_width': use_container_width}
+        st.dataframe(squad_manifest_df(p_data['squad'], with_team=with_team), hide_index=True, **table_kwargs)
+    elif p_data:
+        st.info(empty_msg)
+
+@st.fragment(run_every=1)
+def render_auction_clock_fragment(room_code):
+    """Lot countdown: timer bar, bid/bidder/time metrics and progress bar.
+
+    Ticks on its own every second, so the rest of the live auction (which refreshes
+    every 5s) is not re-run for each tick. Each tick re-reads the room through
+    load_auction_data (session cache, no extra Firebase read), so a new bid shows and
+    restarts the clock here right away. When the clock runs out it triggers one app
+    rerun per timer start, and that run settles the lot.
+    """
+    room = load_auction_data()['rooms'].get(room_code) or {}
+    live_auction = room.get('live_auction') or {}
+    if not live_auction.get('active'):
+        return  # lot closed since the auction fragment last ran; it redraws shortly
+    current_bid = live_auction.get('current_bid', 0)
+    current_bidder = live_auction.get('current_bidder')
+    timer_duration = live_auction.get('timer_duration', 60)
+    time_remaining = max(0, timer_duration - auction_timer_elapsed(live_auction))
+
+    # Timer bar visual
+    timer_bar(time_remaining, timer_duration)
+    st.write("")  # Spacer
+
+    # === 3. METRICS & TIMER ===
+    c1, c2, c3 = st.columns([1, 1, 1])
+    with c1:
+        st.metric("💰 Current Bid", f"{current_bid}M", delta="Leading" if current_bid > 0 else None)
+    with c2:
+        # Active Bidder Name
+        bidder_display = current_bidder if current_bidder else "Waiting..."
+        st.metric("👑 Top Bidder", bidder_display)
+    with c3:
+        # Timer with Color Logic
+        if time_remaining > 10:
+            st.metric("⏱️ Time Left", f"{int(time_remaining)}s")
+        elif time_remaining > 0:
+            st.metric("⏱️ Time Left", f"{int(time_remaining)}s", delta="HURRY UP!", delta_color="inverse")
+        else:
+            st.metric("⏱️ Time Left", "0s", delta="- SOLD -", delta_color="off")
+
+    # Thin elegant progress bar
+    st.progress(time_remaining / timer_duration)
+
+    # Expired: rerun the app once for this timer start so the auction fragment runs
+    # its auto-sell/pass (a bid restarts the timer and re-arms this)
+    timer_key = (live_auction.get('current_player'), live_auction.get('timer_start_ts', live_auction.get('timer_start')))
+    if time_remaining <= 0 and st.session_state.get('_auction_clock_expired') != timer_key:
+        st.session_state['_auction_clock_expired'] = timer_key
+        st.rerun()
+
 # =====================================
 # MAIN APP (Inside a Room)
 # =====================================
@@ -695,22 +1260,15 @@ def render_live_auction_fragment(room_code, user):
     auction_data = load_auction_data()
     room = auction_data['rooms'].get(room_code)
     if not room: return
-    # players_db is global
     is_admin = room['admin'] == user
+    # name/user -> participant, shared by the lobby, dashboard, bidding and sale code below
+    participants_by_name, participants_by_user = participant_index(room)
     
-    # Get all teams from players
-    teams_with_players = {}
-    for player in players_db:
-        team = player.get('country', 'Unknown')
-        if team not in teams_with_players:
-            teams_with_players[team] = []
-        teams_with_players[team].append(player)
+    # Get all teams from players (grouped once per process, not on every 5s refresh)
+    teams_with_players = load_players_by_team(active_tournament_type)
         
-    # Get Draft Status
-    all_drafted_players = set()
-    for p in room.get('participants', []):
-        for pl in p['squad']:
-            all_drafted_players.add(pl['name'])
+    # Get Draft Status (room is re-read each refresh, so this stays per-render)
+    all_drafted_players = drafted_player_names(room)
 
     st.subheader("🔴 Live Auction")
     
@@ -719,19 +1277,11 @@ def render_live_auction_fragment(room_code, user):
         all_teams_list = sorted(list(teams_with_players.keys()))
         view_team = st.selectbox("Select Team", all_teams_list, key="view_real_squad_select")
         if view_team:
-            t_players = teams_with_players[view_team]
-            # Create DF
-            t_data = []
-            for tp in t_players:
-                status = "✅ Taken" if tp['name'] in all_drafted_players else "Popcorn" # Wait, "Available"?
-                # Status: Taken or Available
-                status = "🔴 Taken" if tp['name'] in all_drafted_players else "🟢 Available"
-                t_data.append({
-                    "Player": tp['name'],
-                    "Role": tp.get('role', '-'),
-                    "Status": status
-                })
-            st.dataframe(pd.DataFrame(t_data), hide_index=True, use_container_width=True)
+            t_rows = tuple(
+                (tp['name'], tp.get('role', '-'), tp['name'] in all_drafted_players)
+                for tp in teams_with_players[view_team]
+            )
+            st.dataframe(reference_squad_df(t_rows), hide_index=True, use_container_width=True)
     
     if room.get('big_auction_complete'):
         st.success("✅ Big Auction is complete! Use 'Open Bidding' tab to bid on unsold players.")
@@ -763,12 +1313,12 @@ def render_live_auction_fragment(room_code, user):
                     selected_team_idx = st.selectbox("Select Team to Auction", range(len(team_options)), format_func=lambda x: team_options[x])
                     selected_team = available_teams[selected_team_idx][0]
                     
-                    # Show players from this team
-                    team_players = [p for p in teams_with_players[selected_team] if p['name'] not in all_drafted_players]
-                    
-                    # Sort by role: batsman -> allrounder -> bowler
-                    role_order = {'WK-Batsman': 0, 'Batsman': 1, 'Batting Allrounder': 2, 'Bowling Allrounder': 3, 'Bowler': 4}
-                    team_players.sort(key=lambda x: role_order.get(x.get('role', 'Unknown'), 99))
+                    # Show players from this team, batsman -> allrounder -> bowler
+                    # (filtering the pre-sorted list keeps that order; no per-rerun sort)
+                    team_players = [
+                        p for p in load_auction_order_by_team(active_tournament_type)[selected_team]
+                        if p['name'] not in all_drafted_players
+                    ]
                     
                     st.write("**Auction order:**")
                     for i, p in enumerate(team_players[:10], 1):  # Show first 10
@@ -776,12 +1326,11 @@ def render_live_auction_fragment(room_code, user):
                     if len(team_players) > 10:
                         st.caption(f"...and {len(team_players) - 10} more")
                     
-                    # Check if hidden/paused auction exists
-                    existing_auction = room.get('live_auction')
-                    if existing_auction and not existing_auction.get('active') and existing_auction.get('current_team') == selected_team:
+                    # Check if hidden/paused auction exists (live_auction is the room's dict, read once above)
+                    if live_auction and not live_auction.get('active') and live_auction.get('current_team') == selected_team:
                         st.warning(f"⚠️ A paused auction exists for {selected_team}")
                         if st.button("▶️ Resume Auction for " + selected_team, type="primary"):
-                            existing_auction['active'] = True
+                            live_auction['active'] = True
                             # Adjust timer start to account for pause? Simple approach: Just reset timer for current player?
                             # Or better: keep it paused until new bid?
                             # User requested "nothing gets affected".
@@ -798,9 +1347,9 @@ def render_live_auction_fragment(room_code, user):
                             # For now, let's just RESET timer to 90s for FAIRNESS upon resume?
                             # Or assume admin wants to continue.
                             # Let's update timer_start to `get_ist_time()` to give fresh 60s (fair for network issues).
-                            existing_auction['timer_start'] = get_ist_time().isoformat()
+                            restart_auction_timer(live_auction)
                             
-                            room['live_auction'] = existing_auction
+                            room['live_auction'] = live_auction
                             save_auction_data(auction_data)
                             st.rerun()
                         
@@ -810,15 +1359,16 @@ def render_live_auction_fragment(room_code, user):
                                 'active': True,
                                 'current_team': selected_team,
                                 'player_queue': [p['name'] for p in team_players],
+                                'queue_index': 0,
                                 'current_player': team_players[0]['name'] if team_players else None,
                                 'current_player_role': team_players[0].get('role', 'Unknown') if team_players else None,
                                 'current_bid': 0,
                                 'current_bidder': None,
-                                'timer_start': get_ist_time().isoformat(),
                                 'timer_duration': 60,
                                 'opted_out': [],
                                 'auction_started_at': get_ist_time().isoformat()
                             }
+                             restart_auction_timer(room['live_auction'])
                              save_auction_data(auction_data)
                              st.rerun()
                     
@@ -828,15 +1378,16 @@ def render_live_auction_fragment(room_code, user):
                             'active': True,
                             'current_team': selected_team,
                             'player_queue': [p['name'] for p in team_players],
+                            'queue_index': 0,
                             'current_player': team_players[0]['name'] if team_players else None,
                             'current_player_role': team_players[0].get('role', 'Unknown') if team_players else None,
                             'current_bid': 0,
                             'current_bidder': None,
-                            'timer_start': get_ist_time().isoformat(),
                             'timer_duration': 60,  # Updated to 60 seconds
                             'opted_out': [], # List of participants who opted out
                             'auction_started_at': get_ist_time().isoformat()
                         }
+                        restart_auction_timer(room['live_auction'])
                         save_auction_data(auction_data)
                         st.rerun()
                 else:
@@ -878,29 +1429,15 @@ def render_live_auction_fragment(room_code, user):
                      
                      st.markdown("---")
                      st.caption("📋 **Detailed Squad View**")
-                     p_options = ["None"] + [p['name'] for p in room.get('participants', [])]
-                     selected_p_view = st.selectbox("Select Participant to view Squad", p_options, key="waiting_dash_select")
-                     
-                     if selected_p_view != "None":
-                         p_data = next((p for p in room.get('participants', []) if p['name'] == selected_p_view), None)
-                         if p_data and p_data['squad']:
-                             squad_df = []
-                             for pl in p_data['squad']:
-                                 squad_df.append({
-                                     "Player": pl['name'],
-                                     "Role": pl.get('role', 'Unknown'),
-                                     "Team": pl.get('team', 'Unknown'),
-                                     "Price": f"{pl['buy_price']}M"
-                                 })
-                             st.dataframe(pd.DataFrame(squad_df), hide_index=True)
-                         elif p_data:
-                             st.info("No players in squad yet.")
+                     render_squad_manifest_picker(
+                         room, participants_by_name, "Select Participant to view Squad",
+                         placeholder="None", key="waiting_dash_select",
+                         empty_msg="No players in squad yet.", with_team=True,
+                     )
 
                 st.json({"status": "waiting", "admin": room['admin'], "time": get_ist_time().strftime("%H:%M:%S")})
-                
-                # Auto-refresh to check for start
-                time.sleep(5)
-                st.rerun()
+                # No sleep/rerun here: the fragment's run_every=5 re-checks for the start
+                # without blocking the script or re-running the whole page.
         
         else:
             # === ACTIVE AUCTION MODE ===
@@ -921,34 +1458,28 @@ def render_live_auction_fragment(room_code, user):
 
                  st.markdown("---")
                  st.caption("📋 **Detailed Squad View**")
-                 p_options = ["Select Team..."] + [p['name'] for p in room.get('participants', [])]
-                 selected_p_view = st.selectbox("View Squad", p_options, label_visibility="collapsed", key="active_dash_select")
-                 
-                 if selected_p_view != "Select Team...":
-                     p_data = next((p for p in room.get('participants', []) if p['name'] == selected_p_view), None)
-                     if p_data and p_data['squad']:
-                         squad_df = []
-                         for pl in p_data['squad']:
-                             squad_df.append({
-                                 "Player": pl['name'],
-                                 "Role": pl.get('role', 'Unknown'),
-                                 "Price": f"{pl['buy_price']}M"
-                             })
-                         st.dataframe(pd.DataFrame(squad_df), hide_index=True, use_container_width=True)
-                     elif p_data:
-                         st.info("No players acquired yet.")
+                 render_squad_manifest_picker(
+                     room, participants_by_name, "View Squad",
+                     placeholder="Select Team...", key="active_dash_select",
+                     empty_msg="No players acquired yet.",
+                     label_visibility="collapsed", use_container_width=True,
+                 )
 
             current_role = live_auction.get('current_player_role', 'Unknown')
             current_team = live_auction.get('current_team')
             current_bid = live_auction.get('current_bid', 0)
 
             current_bidder = live_auction.get('current_bidder')
-            timer_start = datetime.fromisoformat(live_auction.get('timer_start', get_ist_time().isoformat()))
             timer_duration = live_auction.get('timer_duration', 60)
             opted_out = live_auction.get('opted_out', [])
+            opted_out_set = frozenset(opted_out)  # membership checks; the list stays the stored form
+            # Widget keys are per player so inputs reset on each new lot; build them once per render
+            bid_select_key, bid_input_key, bid_btn_key, optout_btn_key = (
+                f"{kind}_{current_player}_uniq" for kind in ("bid_select", "bid_input", "bid_btn", "optout_btn")
+            )
             
             # Calculate time remaining
-            elapsed = (get_ist_time() - timer_start).total_seconds()
+            elapsed = auction_timer_elapsed(live_auction)
             time_remaining = max(0, timer_duration - elapsed)
             
             # === 2. FEATURED PLAYER CARD (Main Floor) ===
@@ -960,6 +1491,12 @@ def render_live_auction_fragment(room_code, user):
             elif "Allrounder" in current_role: role_icon = "🦄"
             elif "WK" in current_role: role_icon = "🧤"
             
+            # Previous lot's outcome, persisted so every viewer sees it, not just the
+            # session that closed the lot; it simply stops rendering once expired
+            last_result = live_auction.get('last_result')
+            if last_result and time.time() < last_result.get('until_ts', 0):
+                st.info(last_result['msg'])
+            
             # Explicitly left-aligned string to avoid Markdown code-block interpretation
             # === 2. FEATURED PLAYER (PREMIUM CARD) ===
             auction_player_card(
@@ -970,35 +1507,14 @@ def render_live_auction_fragment(room_code, user):
                 bidder=current_bidder or ''
             )
             
-            # Timer bar visual
-            timer_bar(time_remaining, timer_duration)
-            st.write("")  # Spacer
-            
-            # === 3. METRICS & TIMER ===
-            c1, c2, c3 = st.columns([1, 1, 1])
-            with c1:
-                st.metric("💰 Current Bid", f"{current_bid}M", delta="Leading" if current_bid > 0 else None)
-            with c2:
-                # Active Bidder Name
-                bidder_display = current_bidder if current_bidder else "Waiting..."
-                st.metric("👑 Top Bidder", bidder_display)
-            with c3:
-                # Timer with Color Logic
-                if time_remaining > 10:
-                    st.metric("⏱️ Time Left", f"{int(time_remaining)}s")
-                elif time_remaining > 0:
-                    st.metric("⏱️ Time Left", f"{int(time_remaining)}s", delta="HURRY UP!", delta_color="inverse")
-                else:
-                    st.metric("⏱️ Time Left", "0s", delta="- SOLD -", delta_color="off")
-            
-            # Thin elegant progress bar
-            st.progress(time_remaining / timer_duration)
+            # Timer bar, metrics and progress tick in their own 1s fragment
+            render_auction_clock_fragment(room_code)
             
             # Auto-Sell / Auto-Pass Logic
             # If timer expired OR (everyone else opted out and there is a bidder)
-            active_participants_count = len([p for p in room.get('participants', []) if p['name'] not in opted_out])
+            active_participants_count = sum(1 for p in room.get('participants', []) if p['name'] not in opted_out_set)
             # If current bidder exists, they are active but we don't count them as "others"
-            others_active = active_participants_count - (1 if current_bidder and current_bidder not in opted_out else 0)
+            others_active = active_participants_count - (1 if current_bidder and current_bidder not in opted_out_set else 0)
             
             should_autosell = (time_remaining <= 0 and current_bidder) or (current_bidder and others_active == 0)
             should_autopass = (time_remaining <= 0 and not current_bidder) or (not current_bidder and active_participants_count == 0)
@@ -1013,8 +1529,8 @@ def render_live_auction_fragment(room_code, user):
             
             # Determine current user's participant status
             my_name = st.session_state.get('logged_in_user', 'Unknown')
-            my_participant = next((p for p in room.get('participants', []) if p.get('user') == my_name), None)
-            is_my_turn = my_participant and my_participant['name'] not in opted_out and my_participant['name'] != current_bidder
+            my_participant = participants_by_user.get(my_name)
+            is_my_turn = my_participant and my_participant['name'] not in opted_out_set and my_participant['name'] != current_bidder
             
             if not should_autosell and not should_autopass:
                 st.markdown("### 🎯 Place Your Bid")
@@ -1029,36 +1545,29 @@ def render_live_auction_fragment(room_code, user):
                         # Column 1: Bidder Selection
                         with col1:
                             if is_admin:
-                                bidder_options = [p['name'] for p in room.get('participants', []) if p['name'] not in opted_out]
+                                bidder_options = [p['name'] for p in room.get('participants', []) if p['name'] not in opted_out_set]
                                 default_idx = 0
                                 if my_participant and my_participant['name'] in bidder_options:
                                     default_idx = bidder_options.index(my_participant['name'])
-                                bidder_name = st.selectbox("Bidder", bidder_options, index=default_idx, key=f"bid_select_{current_player}_uniq")
+                                bidder_name = st.selectbox("Bidder", bidder_options, index=default_idx, key=bid_select_key)
                             else:
-                                if my_participant and my_participant['name'] not in opted_out:
+                                if my_participant and my_participant['name'] not in opted_out_set:
                                     bidder_name = my_participant['name']
-                                    st.text_input("Bidder", value=bidder_name, disabled=True, key=f"bid_select_{current_player}_uniq")
+                                    st.text_input("Bidder", value=bidder_name, disabled=True, key=bid_select_key)
                                 else:
                                     bidder_name = None
                                     st.warning("You are not an active participant for this player")
                             
-                            bidder = next((p for p in room.get('participants', []) if p['name'] == bidder_name), None)
+                            bidder = participants_by_name.get(bidder_name)
     
                         # Column 2: Bid Amount
                         with col2:
                             if bidder:
                                 # Dynamic Bidding Rules
-                                if current_bid >= 100:
-                                    increment = 10
-                                elif current_bid >= 50:
-                                    increment = 5
-                                else:
-                                    increment = 1
-                                
-                                min_bid = max(5, current_bid + increment)
+                                min_bid = max(5, current_bid + bid_increment(current_bid))
                                 max_bid_allowed = bidder.get('budget', 0)
                                 
-                                step_val = 10 if min_bid >= 100 else (5 if min_bid >= 50 else 1)
+                                step_val = bid_increment(min_bid)
                                 
                                 if max_bid_allowed >= min_bid:
                                     bid_amount = st.number_input(
@@ -1068,7 +1577,7 @@ def render_live_auction_fragment(room_code, user):
                                         value=int(min_bid),
                                         step=step_val,
                                         format="%d",
-                                        key=f"bid_input_{current_player}_uniq"
+                                        key=bid_input_key
                                     )
                                 else:
                                     st.error(f"Low Budget")
@@ -1079,7 +1588,7 @@ def render_live_auction_fragment(room_code, user):
                         # Column 3: Actions
                         with col3:
                             # Bid Button
-                            if st.button("🔨 BID!", type="primary", disabled=(bid_amount==0), key=f"bid_btn_{current_player}_uniq"):
+                            if st.button("🔨 BID!", type="primary", disabled=(bid_amount==0), key=bid_btn_key):
                                 valid_increment = True
                                 err_msg = ""
                                 
@@ -1096,7 +1605,7 @@ def render_live_auction_fragment(room_code, user):
                                 else:
                                     live_auction['current_bid'] = bid_amount
                                     live_auction['current_bidder'] = bidder_name
-                                    live_auction['timer_start'] = get_ist_time().isoformat()
+                                    restart_auction_timer(live_auction)
                                     room['live_auction'] = live_auction
                                     save_auction_data(auction_data)
                                     st.rerun()
@@ -1110,7 +1619,7 @@ def render_live_auction_fragment(room_code, user):
                             if am_i_holding:
                                 st.success("👑 You hold the bid")
                             elif is_my_turn:
-                                if st.button("❌ Opt Out", key=f"optout_btn_{current_player}_uniq"):
+                                if st.button("❌ Opt Out", key=optout_btn_key):
                                     live_auction.setdefault('opted_out', []).append(my_participant['name'])
                                     room['live_auction'] = live_auction
                                     save_auction_data(auction_data)
@@ -1152,7 +1661,6 @@ def render_live_auction_fragment(room_code, user):
                                 room['live_auction'] = live_auction
                                 save_auction_data(auction_data)
                                 st.success(f"Revived {revive_target}!")
-                                import time
                                 time.sleep(1)
                                 st.rerun()
                     
@@ -1163,19 +1671,13 @@ def render_live_auction_fragment(room_code, user):
                             p['budget'] = p.get('budget', 0) + 150
                         save_auction_data(auction_data)
                         st.success("✅ Added 150M to everyone's budget!")
-                        import time
                         time.sleep(1)
                         st.rerun()
 
             # Handle Sale / Unsold
             if should_autosell or force_sell:
-                st.success(f"🎉 **SOLD!** {current_player} to **{current_bidder}** for **{current_bid}M**")
-                # Auto-execute after brief delay or showing the message
-                # We need a way to show the success message before switching.
-                # We can use a short sleep then execute.
-                
                 # EXECUTE SALE
-                winner = next((p for p in room.get('participants', []) if p['name'] == current_bidder), None)
+                winner = participants_by_name.get(current_bidder)
                 if winner:
                     winner['squad'].append({
                         'name': current_player,
@@ -1192,67 +1694,313 @@ def render_live_auction_fragment(room_code, user):
                         'time': get_ist_time().isoformat()
                     })
                     
-                    # Move to next
-                    queue = live_auction.get('player_queue', [])
-                    if current_player in queue:
-                        queue.remove(current_player)
+                    # Shown to every viewer for a few seconds (see LAST_RESULT_SECONDS)
+                    live_auction['last_result'] = {
+                        'msg': f"🎉 **SOLD!** {current_player} to **{current_bidder}** for **{current_bid}M**",
+                        'until_ts': time.time() + LAST_RESULT_SECONDS,
+                    }
                     
-                    if queue:
-                        next_player = queue[0]
-                        live_auction['current_player'] = next_player
-                        live_auction['current_player_role'] = player_role_lookup.get(next_player, 'Unknown')
-                        live_auction['current_bid'] = 0
-                        live_auction['current_bidder'] = None
-                        live_auction['timer_start'] = get_ist_time().isoformat()
-                        live_auction['opted_out'] = []
-                        live_auction['player_queue'] = queue
-                    else:
-                        live_auction['active'] = False
+                    # Move to next
+                    if not advance_auction_queue(live_auction):
                         st.balloons()
                     
                     room['live_auction'] = live_auction
                     save_auction_data(auction_data)
-                    import time
-                    time.sleep(3) # Show result for 3s then next
                     st.rerun()
 
             elif should_autopass or force_unsold:
-                st.warning(f"⏸️ **UNSOLD** - {current_player}")
-                
                 # EXECUTE UNSOLD
                 room.setdefault('unsold_players', []).append(current_player)
+                live_auction['last_result'] = {
+                    'msg': f"⏸️ **UNSOLD** - {current_player}",
+                    'until_ts': time.time() + LAST_RESULT_SECONDS,
+                }
                 
-                queue = live_auction.get('player_queue', [])
-                if current_player in queue:
-                    queue.remove(current_player)
-                    
-                if queue:
-                    next_player = queue[0]
-                    live_auction['current_player'] = next_player
-                    live_auction['current_player_role'] = player_role_lookup.get(next_player, 'Unknown')
-                    live_auction['current_bid'] = 0
-                    live_auction['current_bidder'] = None
-                    live_auction['timer_start'] = get_ist_time().isoformat()
-                    live_auction['opted_out'] = []
-                    live_auction['player_queue'] = queue
-                else:
-                    live_auction['active'] = False
+                advance_auction_queue(live_auction)
                 
                 room['live_auction'] = live_auction
                 save_auction_data(auction_data)
-                import time
-                time.sleep(3)
                 st.rerun()
-            
 
+
+@st.fragment
+def render_squad_dashboard_fragment(room_code):
+    """Squad Dashboard tab body. As a fragment, the filters and refresh button rerun
+    only this table instead of the whole page."""
+    room = load_auction_data()['rooms'].get(room_code)
+    if not room: return
+    st.subheader("👤 Squad Dashboard")
+    
+    # Clicking the button already reruns the fragment; no explicit st.rerun() needed
+    st.button("🔄 Refresh Now")
+
+    # Tuple rows: cheap to build and hash as the cache key for squad_dashboard_df.
+    # The DB team lookup only runs for squad entries saved without a team.
+    get_team = player_team_lookup.get
+    all_squads_data = [
+        (p['name'], pl['name'], pl.get('role', 'Unknown'),
+         pl['team'] if 'team' in pl else get_team(pl['name'], 'Unknown'),
+         pl.get('buy_price', 0))
+        for p in room.get('participants', []) for pl in p['squad']
+    ]
+    
+    if all_squads_data:
+        df = squad_dashboard_df(tuple(all_squads_data))
+        c1, c2 = st.columns(2)
+        with c1: sel_p = st.multiselect("Filter by Participant", [p['name'] for p in room.get('participants', [])])
+        with c2: search = st.text_input("Search Player")
+        
+        if sel_p: df = df[df['Participant'].isin(sel_p)]
+        # Plain substring match: no regex engine per keystroke, and input like "(" can't raise
+        if search: df = df[df['Player'].str.lower().str.contains(search.lower(), regex=False)]
+        
+        st.dataframe(df, use_container_width=True, hide_index=True)
+    else:
+        st.info("No squads yet.")
+
+
+@st.fragment
+def render_best11_detail_fragment(room, view_mode, display_gw_key, gw_scores, best_11_by_participant):
+    """Standings "Detailed Best 11" section. As a fragment, picking another participant
+    reruns only this section, not the whole standings table.
+
+    `gw_scores` and `best_11_by_participant` come from the By Gameweek standings pass
+    (None / empty in the Overall view).
+    """
+    st.subheader("📋 Detailed Best 11")
+    detail_participant = st.selectbox("View Best 11 for", [p['name'] for p in room.get('participants', [])])
+    detail_p = participant_index(room)[0].get(detail_participant)
+    if detail_p:
+        # === CUMULATIVE VIEW LOGIC ===
+        if view_mode == "Overall (Cumulative)":
+            st.caption("📊 Showing cumulative contribution of players across all gameweeks (using Locked Squads).")
             
-            # Auto-refresh loop for everyone
-            if not should_autosell and not should_autopass:
-                import time
-                time.sleep(1)
-                st.rerun()
+            cumulative_best = {} # name -> {stats}
+            total_score = 0
+            
+            # Iterate all processed GWs sorted
+            sorted_gws = sorted(room.get('gameweek_scores', {}).keys(), key=lambda x: int(x) if x.isdigit() else x)
+            
+            for gw in sorted_gws:
+                scores = room['gameweek_scores'][gw]
+                gw_str = str(gw)
+                
+                # Get Locked Squad
+                locked_squads = room.get('gameweek_squads', {}).get(gw_str, {})
+                squad_data = locked_squads.get(detail_participant)
+                
+                if squad_data:
+                    if isinstance(squad_data, list):
+                        gw_squad = squad_data
+                        gw_ir = None
+                    else:
+                        gw_squad = squad_data.get('squad', [])
+                        gw_ir = squad_data.get('injury_reserve')
+                else:
+                    # Fallback to current if missing (best effort)
+                    gw_squad = detail_p['squad']
+                    gw_ir = detail_p.get('injury_reserve')
+                
+                # Apply Hattrick Bonus for this GW
+                gw_scores_final = scores.copy()
+                hattrick_bonuses = room.get('hattrick_bonuses', {}).get(str(gw), {})
+                for player, bonus in hattrick_bonuses.items():
+                    gw_scores_final[player] = gw_scores_final.get(player, 0) + bonus
+                    
+                # Calculate Best 11 for this GW
+                b11, _ = get_best_11(gw_squad, gw_scores_final, gw_ir, gameweek=gw)
+                
+                # Aggregate
+                for p in b11:
+                    name = p['name']
+                    pts = p['score']
+                    total_score += pts
+                    
+                    if name not in cumulative_best:
+                        cumulative_best[name] = {
+                            "name": name, 
+                            "role": p.get('role', 'Unknown'), 
+                            "category": p.get('category', '?'),
+                            "score": 0,
+                            "gameweeks": []
+                        }
+                    cumulative_best[name]['score'] += pts
+                    cumulative_best[name]['gameweeks'].append(f"GW{gw}({int(pts)})")
+            
+            # Convert to List
+            best_11_data = list(cumulative_best.values())
+            best_11_data.sort(key=lambda x: x['score'], reverse=True)
+            
+            st.markdown(f"**Total Cumulative Score: {int(total_score)}**")
+            
+            # Display nicely
+            if best_11_data:
+                df = pd.DataFrame(best_11_data)
+                # Clean up display
+                df['Breakdown'] = df['gameweeks'].apply(lambda x: ", ".join(x))
+                st.dataframe(df[['name', 'role', 'score', 'Breakdown']], use_container_width=True, hide_index=True)
+            else:
+                st.info("No points scored yet.")
 
+        # === PER-GAMEWEEK VIEW LOGIC ===
+        else:
+            # Use locked squad for this GW if available
+            locked_squads = room.get('gameweek_squads', {}).get(display_gw_key, {}) if display_gw_key else {}
+            squad_data = locked_squads.get(detail_participant)
+            
+            if squad_data:
+                if isinstance(squad_data, list):
+                    detail_squad = squad_data
+                    detail_ir = None
+                else:
+                    detail_squad = squad_data.get('squad', [])
+                    detail_ir = squad_data.get('injury_reserve')
+            else:
+                detail_squad = detail_p['squad']
+                detail_ir = detail_p.get('injury_reserve')
+            
+            # Info: show which squad source
+            if display_gw_key and squad_data:
+                st.caption(f"🔒 Using Locked Squad from GW {display_gw_key}")
+            elif display_gw_key:
+                st.caption(f"⚠️ Using Current Squad (No snapshot found for GW {display_gw_key})")
+            
+            # Same squad/scores/GW as the standings loop, so reuse its result
+            best_11, warnings = best_11_by_participant.get(detail_participant) or \
+                get_best_11(detail_squad, gw_scores, detail_ir, gameweek=display_gw_key)
+            if warnings:
+                for w in warnings: st.warning(w)
+            best_11_df = pd.DataFrame(best_11)
+            st.dataframe(best_11_df, use_container_width=True, hide_index=True)
+
+
+@st.fragment
+def render_standings_fragment(room_code):
+    """Standings page body. As a fragment, switching the view or gameweek reruns only
+    the standings (sidebar, header and automation hooks are left alone)."""
+    room = load_auction_data()['rooms'].get(room_code)
+    if not room: return
+    
+    available_gws = list(room.get('gameweek_scores', {}).keys())
+    
+    if not available_gws:
+        st.info("No gameweeks have been processed yet. Go to Schedule & Admin to process matches.")
+    else:
+        view_mode = st.radio("View", ["Overall (Cumulative)", "By Gameweek"], horizontal=True)
+        
+        # Key to use for detailed view (None = current squad)
+        display_gw_key = None
+        gw_scores = None
+        
+        if view_mode == "By Gameweek":
+            selected_gw = st.selectbox("Select Gameweek", available_gws)
+            if selected_gw:
+                display_gw_key = str(selected_gw)
+            
+            gw_scores = room['gameweek_scores'].get(selected_gw, {}).copy()  # Copy to avoid modifying original
+            
+            # Apply hattrick bonuses for this specific gameweek
+            hattrick_bonuses = room.get('hattrick_bonuses', {}).get(str(selected_gw), {})
+            for player, bonus in hattrick_bonuses.items():
+                existing = gw_scores.get(player, 0)
+                if isinstance(existing, dict):
+                    gw_scores[player] = {k: v + bonus for k, v in existing.items()}
+                else:
+                    gw_scores[player] = existing + bonus
+        # (The Overall view needs no merged score table: standings and the detail
+        # view score each GW against that GW's locked squad, below.)
+        
+        # get_best_11 is now defined at module level (shared with knockout code)
+        
+        # Calculate standings (collected as columns; sorted once by pandas below)
+        st_participants, st_points, st_best11, st_warnings = [], [], [], []
+        best_11_by_participant = {}  # per-GW results, reused by the detail view below
+        
+        if view_mode == "By Gameweek":
+            # === SINGLE GAMEWEEK VIEW ===
+            # Logic: Use locked squad for this GW (if available) or current squad.
+            if selected_gw:
+                # gw_scores already set above
+                # Ensure string key for lookup (keys could be int or str)
+                gw_key = str(selected_gw)
+                locked_squads = room.get('gameweek_squads', {}).get(gw_key, {})
+                
+                # Debug info
+                squad_source = "🔒 Locked Squads" if locked_squads else "⚠️ Current Squads (no snapshot found)"
+                st.caption(f"Squad source: {squad_source} | GW key: '{gw_key}' | Available snapshots: {list(room.get('gameweek_squads', {}).keys())}")
+                
+                fmt_best11_entry = "{0[name]} ({0[score]:.0f})".format  # parsed once, not per player
+                for participant in room.get('participants', []):
+                    p_name = participant['name']
+                    display_name = f"💀 {p_name}" if participant.get('eliminated') else p_name
+                    
+                    # Resolve Squad
+                    squad_data = locked_squads.get(p_name)
+                    if squad_data:
+                        if isinstance(squad_data, list):
+                            squad = squad_data
+                            ir_player = None
+                        else:
+                            squad = squad_data.get('squad', [])
+                            ir_player = squad_data.get('injury_reserve')
+                    else:
+                        squad = participant['squad']
+                        ir_player = participant.get('injury_reserve')
+                    
+                    best_11, warnings = get_best_11(squad, gw_scores, ir_player, gameweek=selected_gw)
+                    best_11_by_participant[p_name] = (best_11, warnings)
+                    total_points = sum(p['score'] for p in best_11)
+                    
+                    st_participants.append(display_name)
+                    st_points.append(total_points)
+                    st_best11.append(", ".join(map(fmt_best11_entry, best_11[:3])) + "...")
+                    st_warnings.append(" ".join(warnings) if warnings else "OK")
 
+        else:
+            # === OVERALL CUMULATIVE VIEW ===
+            # Logic: Sum of (Score for GW_i using Squad_Locked_at_GW_i)
+            # Correctly accounts for transfers/loans over time.
+            
+            all_participants = room.get('participants', [])
+            p_totals = cumulative_totals(room, all_participants)
+            
+            # Build Table
+            for participant in all_participants:
+                p_name = participant['name']
+                display_name = f"💀 {p_name}" if participant.get('eliminated') else p_name
+                
+                st_participants.append(display_name)
+                st_points.append(p_totals[p_name])
+                st_best11.append("Cumulative Score")
+                st_warnings.append("OK")
+        
+        # Stable sort keeps the original participant order for tied points
+        standings_df = pd.DataFrame({
+            "Participant": st_participants,
+            "Points": st_points,
+            "Best 11": st_best11,
+            "Warnings": st_warnings,
+        }).sort_values("Points", ascending=False, kind="stable", ignore_index=True)
+        
+        if not standings_df.empty:
+            st.subheader("🏆 Current Standings")
+            
+            if len(standings_df) >= 3:
+                cols = st.columns(3)
+                medals = ["🥇", "🥈", "🥉"]
+                for i, col in enumerate(cols):
+                    with col:
+                        st.metric(
+                            label=f"{medals[i]} {standings_df.at[i, 'Participant']}",
+                            value=f"{standings_df.at[i, 'Points']:.0f} pts"
+                        )
+            
+            st.dataframe(standings_df, use_container_width=True, hide_index=True)
+            
+            st.divider()
+            render_best11_detail_fragment(room, view_mode, display_gw_key, gw_scores, best_11_by_participant)
+        else:
+            st.info("No participants have been added yet. Go to Auction Room to add participants.")
 
 
 def show_main_app():
@@ -1298,6 +2046,7 @@ def show_main_app():
             'error': None,
         }
         try:
+            # Imported lazily: api_server pulls in FastAPI and its whole app, only needed here
             import api_server as _api
             _auto_result['steps'].append(f"✅ api_server imported successfully")
             _auto_result['steps'].append(f"ℹ️ Room tournament_type: {repr(room.get('tournament_type'))}")
@@ -1353,7 +2102,6 @@ def show_main_app():
                 _auto_result['steps'].append("ℹ️ No changes to save")
                 
         except Exception as _auto_exc:
-            import traceback as _tb
             _err_msg = f"{type(_auto_exc).__name__}: {_auto_exc}"
             _auto_result['error'] = _err_msg
             _auto_result['steps'].append(f"💥 FATAL: {_err_msg}")
@@ -1507,7 +2255,7 @@ def show_main_app():
                 if p_claim:
                     # Validate PIN
                     if p_claim.get('pin_hash'):
-                        if not pin_input or hash_password(pin_input) != p_claim['pin_hash']:
+                        if not pin_input or not verify_password(p_claim['pin_hash'], pin_input):
                             st.error("❌ Incorrect PIN. Please ask the Admin for your Squad PIN.")
                             return
 
@@ -1577,25 +2325,11 @@ def show_main_app():
     # === GLOBAL BUDGET VISIBILITY ===
     # === GLOBAL TEAM STATS VISIBILITY ===
     with st.sidebar.expander("📊 All Team Stats & Budgets", expanded=False):
-        stats_data = []
-        for p in room.get('participants', []):
-            squad_list = p.get('squad', [])
-            # Count Roles
-            n_bat = sum(1 for pl in squad_list if player_role_lookup.get(pl['name']) == 'Batsman')
-            n_bowl = sum(1 for pl in squad_list if player_role_lookup.get(pl['name']) == 'Bowler')
-            n_ar = sum(1 for pl in squad_list if player_role_lookup.get(pl['name']) in ['Batting Allrounder', 'Bowling Allrounder'])
-            n_wk = sum(1 for pl in squad_list if player_role_lookup.get(pl['name']) == 'WK-Batsman')
-            
-            stats_data.append({
-                "Team": p['name'], 
-                "Plyrs": len(squad_list),
-                "Bat": n_bat,
-                "Bowl": n_bowl,
-                "AR": n_ar,
-                "WK": n_wk,
-                "Budget": f"{p.get('budget', 0)}M"
-            })
-        st.sidebar.dataframe(pd.DataFrame(stats_data), hide_index=True, use_container_width=True)
+        team_sig = tuple(
+            (p['name'], p.get('budget', 0), tuple(pl['name'] for pl in p.get('squad', [])))
+            for p in room.get('participants', [])
+        )
+        st.sidebar.dataframe(team_stats_df(team_sig, active_tournament_type), hide_index=True, use_container_width=True)
 
     st.sidebar.divider()
     page = st.sidebar.radio("Navigation", ["📊 Calculator", "👤 Squads & Trading", "📅 Schedule & Admin", "🏆 Standings", "🏅 Top Scorers"])
@@ -1666,7 +2400,6 @@ def show_main_app():
                     st.error("Please enter a valid WhoScored Match Report URL.")
                 else:
                     with st.spinner("Fetching match data and calculating scores..."):
-                        import football_score_calculator
                         try:
                             result_df = football_score_calculator.calc_all_players_whoscored(url)
                             if result_df.empty:
@@ -1702,36 +2435,32 @@ def show_main_app():
                 else:
                     with st.spinner("Fetching match data..."):
                         try:
-                            scraper = cricbuzz_scraper.CricbuzzScraper()
-                            calculator = CricketScoreCalculator()
+                            scraper = get_cricbuzz_scraper()
+                            calculator = get_cricket_calculator()
                             players = scraper.fetch_match_data(url)
                             
                             if not players:
                                 st.error("Could not fetch player data. Please check the URL.")
                             else:
-                                results = []
-                                for p in players:
-                                    score = calculator.calculate_score(p)
-                                    results.append({
-                                        "Player": p['name'],
-                                        "Role": p.get('role', 'Unknown'),
-                                        "Points": score,
-                                        "Runs": p.get('runs', 0),
-                                        "Wickets": p.get('wickets', 0),
-                                        "Catches": p.get('catches', 0)
-                                    })
-                                
-                                df = pd.DataFrame(results)
-                                df = df.sort_values(by="Points", ascending=False).reset_index(drop=True)
+                                # Built as columns: one DataFrame ctor, no per-row dicts
+                                df = pd.DataFrame({
+                                    "Player": [p['name'] for p in players],
+                                    "Role": [p.get('role', 'Unknown') for p in players],
+                                    "Points": calculator.calculate_scores(players),
+                                    "Runs": [p.get('runs', 0) for p in players],
+                                    "Wickets": [p.get('wickets', 0) for p in players],
+                                    "Catches": [p.get('catches', 0) for p in players],
+                                })
+                                df = df.sort_values(by="Points", ascending=False, ignore_index=True)
                                 
                                 st.subheader("🏆 Leaderboard")
                                 top_3 = df.head(3)
                                 cols = st.columns(3)
                                 medals = ["🥇", "🥈", "🥉"]
                                 
-                                for i, (index, row) in enumerate(top_3.iterrows()):
+                                for i, (name, points, role) in enumerate(zip(top_3['Player'], top_3['Points'], top_3['Role'])):
                                     with cols[i]:
-                                        st.metric(label=f"{medals[i]} {row['Player']}", value=f"{row['Points']} pts", delta=row['Role'])
+                                        st.metric(label=f"{medals[i]} {name}", value=f"{points} pts", delta=role)
                                 
                                 st.dataframe(df, use_container_width=True, height=600)
                                 
@@ -1766,7 +2495,8 @@ def show_main_app():
 
             # Helper: Get current participant info
             my_p_name_check = st.session_state.get('logged_in_user')
-            my_participant = next((p for p in room.get('participants', []) if p.get('user') == my_p_name_check), None)
+            bid_participants_by_name, bid_participants_by_user = participant_index(room)
+            my_participant = bid_participants_by_user.get(my_p_name_check)
 
             # Check if participant is eliminated
             is_eliminated = my_participant.get('eliminated', False) if my_participant else False
@@ -1898,8 +2628,7 @@ def show_main_app():
                 trading_close     = global_deadline + timedelta(minutes=45)   # Trading closes
 
                 # Pass milestones as JSON for the JS countdown
-                import json as _json
-                milestones_js = _json.dumps([
+                milestones_js = json.dumps([
                     {"title": "\U0001f6ab New Bids Lock",      "desc": "No new player initiations", "iso": initiation_cutoff.isoformat()},
                     {"title": "\u26a1 5M Increments Only", "desc": "Only 5M bid steps allowed", "iso": increment_cutoff.isoformat()},
                     {"title": "\U0001f512 Bidding Closes",    "desc": "All bidding stops",          "iso": bidding_close.isoformat()},
@@ -1991,45 +2720,15 @@ def show_main_app():
             bidding_allowed = is_bidding_active and not deadline_passed and not (is_eliminated and not is_admin)
             
             # Process expired bids (auto-award to winners)
+            awarded_bids = award_expired_bids(room, bid_participants_by_name, now, global_deadline)
             active_bids = room.get('active_bids', [])
-            awarded_bids = []
-            
-            for bid in active_bids:
-                expires = datetime.fromisoformat(bid['expires'])
-                # Award if: bid expired OR deadline passed
-                should_award = now >= expires
-                if global_deadline and now >= global_deadline:
-                    should_award = True  # Deadline passed, award all bids
-                
-                if should_award:
-                    # Award the player to the bidder
-                    bidder_participant = next((p for p in room.get('participants', []) if p['name'] == bid['bidder']), None)
-                    if bidder_participant and bid['amount'] <= bidder_participant.get('budget', 0):
-                        bidder_participant['squad'].append({
-                            'name': bid['player'],
-                            'role': player_role_lookup.get(bid['player'], 'Unknown'),
-                            'team': player_team_lookup.get(bid['player'], 'Unknown'),
-                            'buy_price': bid['amount']
-                        })
-                        bidder_participant['budget'] -= bid['amount']
-                        awarded_bids.append(bid)
-                        
-                        # === LOGGING ===
-                        timestamp = get_ist_time().strftime('%d-%b %H:%M')
-                        log_msg = f"🔨 Won Bid: **{bid['player']}** won by **{bid['bidder']}** for **{bid['amount']}M**"
-                        room.setdefault('trade_log', []).append({"time": timestamp, "msg": log_msg})
-                        
-                        if bid['player'] in room.get('unsold_players', []):
-                            room['unsold_players'].remove(bid['player'])
-            
-            # Remove awarded bids
-            for ab in awarded_bids:
-                active_bids.remove(ab)
-                st.success(f"🎉 {ab['player']} awarded to {ab['bidder']} for {ab['amount']}M!")
-            
-            room['active_bids'] = active_bids
+            # There is one open bid per player; reversed() keeps the first if that ever slips
+            bids_by_player = {b['player']: b for b in reversed(active_bids)}
             if awarded_bids:
                 save_auction_data(auction_data)
+                st.success("\n\n".join(
+                    f"🎉 {ab['player']} awarded to {ab['bidder']} for {ab['amount']}M!" for ab in awarded_bids
+                ))
             
             # Show current active bids
             st.markdown("### 📋 Active Bids")
@@ -2056,18 +2755,13 @@ def show_main_app():
                 st.info("No active bids. Place a bid on an unsold player below!")
             
             # Get unsold players logic
-            all_drafted = []
-            for p in room.get('participants', []):
-                all_drafted.extend([pl['name'] for pl in p['squad']])
+            all_drafted = drafted_player_names(room)
             
-            unsold_players = room.get('unsold_players', [])
-            # Add players that went unsold (not in any squad)
-            for name in player_names:
-                if name not in all_drafted and name not in unsold_players:
-                    unsold_players.append(name)
-            
-            # Ensure uniqueness
-            unsold_players = list(set(unsold_players))
+            # Add players that went unsold (not in any squad); dict.fromkeys dedups
+            # while keeping the existing unsold order stable across reruns
+            unsold_players = list(dict.fromkeys(
+                room.get('unsold_players', []) + [name for name in player_names if name not in all_drafted]
+            ))
             room['unsold_players'] = unsold_players
             
             # --- RULES ENFORCEMENT ---
@@ -2081,9 +2775,8 @@ def show_main_app():
                 # Rule: No new nominations if < 60 mins left
                 if minutes_remaining < 60:
                     nominations_blocked = True
-                    active_player_names = [b['player'] for b in active_bids]
                     # Filter: Only allow players who are ALREADY active
-                    biddable_players = [p for p in unsold_players if p in active_player_names]
+                    biddable_players = [p for p in unsold_players if p in bids_by_player]
                     
                     st.warning(f"⛔ Nominations Closed (Deadline < 1h). You can ONLY bid on Active players ({len(biddable_players)}).")
             
@@ -2092,7 +2785,7 @@ def show_main_app():
             
             # Get current user's participant profile
             # Strict check: Must be linked user
-            current_participant = next((p for p in room.get('participants', []) if p.get('user') == user), None)
+            current_participant = bid_participants_by_user.get(user)
             
             if not current_participant:
                 st.error("⚠️ You are not linked to any team. You cannot place bids.")
@@ -2114,20 +2807,18 @@ def show_main_app():
             if current_participant:
                 target_player = st.selectbox(
                     "Select Player", 
-                    [""] + sorted(biddable_players), 
+                    [""] + filtered_options(sorted(biddable_players), "players", "bid_player"), 
                     key="bid_player",
                     format_func=format_player_name
                 )
                 
                 if target_player:
-                    existing_bid = next((b for b in active_bids if b['player'] == target_player), None)
+                    existing_bid = bids_by_player.get(target_player)
                     
                     min_bid = 5
                     if existing_bid:
                         curr_amt = float(existing_bid['amount'])
-                        if curr_amt >= 100: interval = 10
-                        elif curr_amt >= 50: interval = 5
-                        else: interval = 1
+                        interval = bid_increment(curr_amt)
                         
                         # Rule: Sniper Mode (< 30 mins) -> Min Increment 5M
                         if global_deadline:
@@ -2138,10 +2829,13 @@ def show_main_app():
                         
                         min_bid = int(math.ceil(curr_amt + interval))
                     
-                    step_val = 10 if min_bid >= 100 else (5 if min_bid >= 50 else 1)
-                    bid_amount = st.number_input(f"Your Bid (Min {min_bid}M)", min_value=int(min_bid), step=step_val, format="%d", key="bid_input_val")
+                    step_val = bid_increment(min_bid)
+                    # Form: typing/stepping the amount doesn't rerun the page; only Place Bid does
+                    with st.form("place_bid_form"):
+                        bid_amount = st.number_input(f"Your Bid (Min {min_bid}M)", min_value=int(min_bid), step=step_val, format="%d", key="bid_input_val")
+                        place_bid_clicked = st.form_submit_button("Place Bid", disabled=not is_bidding_active)
                     
-                    if st.button("Place Bid", key="place_bid", disabled=not is_bidding_active):
+                    if place_bid_clicked:
                         valid_increment = True
                         err_msg = ""
                         
@@ -2168,20 +2862,23 @@ def show_main_app():
                                      f"but {other_bids_total}M is committed to other active bids. "
                                      f"Available: {available_budget}M.")
                         else:
-                            # Remove old bid if exists
-                            if existing_bid:
-                                active_bids.remove(existing_bid)
-                                st.toast(f"Outbid previous bid of {existing_bid['amount']}M!")
-                            
                             expiry_time = now + timedelta(hours=24) 
-                            
-                            new_bid = {
-                                'player': target_player,
+                            bid_fields = {
                                 'amount': int(bid_amount),
                                 'bidder': current_participant['name'],
-                                'expires': expiry_time.isoformat()
+                                'expires': expiry_time.isoformat(),
+                                'expires_ts': int(expiry_time.timestamp())
                             }
-                            active_bids.append(new_bid)
+                            
+                            # Outbid: reuse the player's open bid dict (one bid per player), but
+                            # still move it to the end so active_bids keeps placement order
+                            if existing_bid:
+                                active_bids.remove(existing_bid)
+                                st.toast(f"Outbid previous bid of {existing_bid['amount']}M!")
+                                existing_bid.update(bid_fields)
+                                active_bids.append(existing_bid)
+                            else:
+                                active_bids.append({'player': target_player, **bid_fields})
                             room['active_bids'] = active_bids
                             save_auction_data(auction_data)
                             st.success(f"Bid placed on {target_player} for {bid_amount}M! Win in 24h.")
@@ -2194,7 +2891,7 @@ def show_main_app():
             
             # We reuse current_participant from bidding logic if available
             # Re-fetch participant in case it was cleared by elimination check above
-            release_participant = next((p for p in room.get('participants', []) if p.get('user') == user), None)
+            release_participant = bid_participants_by_user.get(user)
             if is_eliminated and not is_admin:
                 st.error("❌ **You are eliminated.** You cannot release players.")
             elif release_participant:
@@ -2250,21 +2947,11 @@ def show_main_app():
                             st.rerun()
 
                 if current_participant['squad']:
-                    # Calculate current gameweek (based on locked gameweeks)
-                    locked_gws = list(room.get('gameweek_squads', {}).keys())
-                    # FIXED: Use actual current gameweek for logic, not just locked ones
+                    # Use actual current gameweek for logic, not just locked ones
                     current_gw = room.get('current_gameweek', 1)
                     
                     # Check if participant has used their paid release this GW
-                    paid_releases = current_participant.get('paid_releases', {})
-                    # Handle Firebase converting dict to list
-                    if isinstance(paid_releases, list):
-                        used_paid_this_gw = paid_releases[current_gw] if current_gw < len(paid_releases) and paid_releases[current_gw] else False
-                    else:
-                        used_paid_this_gw = paid_releases.get(str(current_gw), False) if current_gw > 0 else False
-                    
-                    knocked_out_teams = set(room.get('knocked_out_teams', []))
-                    player_country_lookup = {p['name']: p.get('country', 'Unknown') for p in players_db}
+                    used_paid_this_gw = used_paid_release(current_participant, current_gw)
                     
                     # Filter out Loaned Players
                     remove_options = [p['name'] for p in current_participant['squad'] if not p.get('loan_origin')]
@@ -2282,13 +2969,14 @@ def show_main_app():
                             if player_obj and player_obj.get('loan_origin'):
                                 st.error(f"🚫 Cannot release {player_to_remove} because they are on loan.")
                             elif player_obj:
-                                player_country = player_country_lookup.get(player_to_remove, 'Unknown')
+                                player_country = player_team_lookup.get(player_to_remove, 'Unknown')
                                 player_ipl_team = player_info_map.get(player_to_remove, {}).get('ipl_team', '')
                                 player_squad_team = player_obj.get('team', '')
-                                is_knocked_out_team = (
-                                    player_country in knocked_out_teams or
-                                    player_ipl_team in knocked_out_teams or
-                                    player_squad_team in knocked_out_teams
+                                # Only needed once a player is picked, and the list is short
+                                knocked_out_teams = room.get('knocked_out_teams', [])
+                                is_knocked_out_team = any(
+                                    team in knocked_out_teams
+                                    for team in (player_country, player_ipl_team, player_squad_team)
                                 )
                             
 
@@ -2360,6 +3048,8 @@ def show_main_app():
         # ================ TAB 2: TRADING ================
         with squad_tabs[1]:
             st.subheader("🔄 Trade Center")
+            # Participant lookups for the accept/transfer/loan handlers below
+            trade_participants_by_name, _ = participant_index(room)
             
             # Check if current user is eliminated
             trade_user_eliminated = False
@@ -2378,19 +3068,35 @@ def show_main_app():
                 my_p_name = my_p['name'] if my_p else user
                 if 'pending_trades' not in room: room['pending_trades'] = []
                 prefill = st.session_state.pop('trade_prefill', None)
+
+                # Option lists shared by the selectboxes below (built once per rerun)
+                participant_names = [p['name'] for p in room.get('participants', [])]
+                # Loans return after the gameweek following the latest locked snapshot
+                loan_current_gw = max((int(gw) for gw in room.get('gameweek_squads', {})), default=0)
+                loan_return_gw = loan_current_gw + 1
                 
+                # Index pending trades in one pass. Trades already accepted and waiting
+                # for admin are kept out of the inbox/outbox and listed separately.
+                # (Every action below saves and reruns, so the index never goes stale.)
+                pending_by_to = defaultdict(list)
+                pending_by_from = defaultdict(list)
+                admin_pending = []
+                trade_labels = {}  # trade id -> "players involved" text, built once per render
+                for t in room['pending_trades']:
+                    trade_labels[t['id']] = trade_players_label(t)
+                    if t.get('status') == 'pending_admin':
+                        admin_pending.append(t)
+                    else:
+                        pending_by_to[t['to']].append(t)
+                        pending_by_from[t['from']].append(t)
+
                 # INBOX
                 st.markdown("### 📬 Incoming Proposals")
-                # Exclude trades already accepted and waiting for admin
-                my_incoming = [t for t in room['pending_trades'] if t['to'] == my_p_name and t.get('status') != 'pending_admin']
+                my_incoming = pending_by_to[my_p_name]
                 if my_incoming:
                     for trade in my_incoming:
                         with st.container():
-                            if trade['type'] == 'Exchange':
-                                give_list = trade.get('give_players', [trade.get('give_player')] if trade.get('give_player') else [])
-                                player_info = f"{', '.join(give_list)} ↔ {trade.get('get_player')}"
-                            else:
-                                player_info = trade.get('player') or f"{trade.get('give_player')} <-> {trade.get('get_player')}"
+                            player_info = trade_labels[trade['id']]
                             
                             # Format Price String
                             p_val = trade.get('price', 0)
@@ -2413,8 +3119,8 @@ def show_main_app():
                                 c2.warning("🔒 Market Closed")
                             else:
                                 if c1.button("✅ Accept", key=f"acc_{trade['id']}"):
-                                    sender = next((p for p in room.get('participants', []) if p['name'] == trade['from']), None)
-                                    receiver = next((p for p in room.get('participants', []) if p['name'] == trade['to']), None)
+                                    sender = trade_participants_by_name.get(trade['from'])
+                                    receiver = trade_participants_by_name.get(trade['to'])
                                     
                                     # Force fresh reload of critical values from room to ensure no stale object refs
                                     # (Although 'room' is reloaded, explicit lookups are safe)
@@ -2509,10 +3215,7 @@ def show_main_app():
     
                                         elif t_type in ["Loan Out", "Loan In"]:
                                              # Loan Validation
-                                             current_gw = 0
-                                             locked_gws = list(room.get('gameweek_squads', {}).keys())
-                                             if locked_gws: current_gw = max([int(gw) for gw in locked_gws])
-                                             return_gw = current_gw + 1
+                                             return_gw = loan_return_gw
                                              
                                              if t_type == "Loan Out":
                                                  # Sender loans TO receiver. Sender gets fee? (Assuming Sender is Owner)
@@ -2582,16 +3285,11 @@ def show_main_app():
                 
                 # OUTGOING (Sent by me)
                 st.markdown("### 📤 Outgoing Proposals (Sent by You)")
-                # Exclude trades already accepted and waiting for admin
-                my_outgoing = [t for t in room['pending_trades'] if t['from'] == my_p_name and t.get('status') != 'pending_admin']
+                my_outgoing = pending_by_from[my_p_name]
                 if my_outgoing:
                     for trade in my_outgoing:
                         with st.container():
-                            if trade['type'] == 'Exchange':
-                                give_list = trade.get('give_players', [trade.get('give_player')] if trade.get('give_player') else [])
-                                player_info = f"{', '.join(give_list)} ↔ {trade.get('get_player')}"
-                            else:
-                                player_info = trade.get('player') or f"{trade.get('give_player')} <-> {trade.get('get_player')}"
+                            player_info = trade_labels[trade['id']]
                             
                             # Price Display Logic
                             price_str = f"Price: {trade.get('price')}M"
@@ -2615,15 +3313,11 @@ def show_main_app():
                 
                 # WAITING FOR ADMIN (For Regular Users)
                 st.markdown("### ⏳ Waiting for Admin Approval")
-                my_pending_admin = [t for t in room['pending_trades'] if (t['from'] == my_p_name or t['to'] == my_p_name) and t.get('status') == 'pending_admin']
+                my_pending_admin = [t for t in admin_pending if t['from'] == my_p_name or t['to'] == my_p_name]
                 if my_pending_admin:
                     for trade in my_pending_admin:
                         with st.container():
-                            if trade['type'] == 'Exchange':
-                                give_list = trade.get('give_players', [trade.get('give_player')] if trade.get('give_player') else [])
-                                player_info = f"{', '.join(give_list)} ↔ {trade.get('get_player')}"
-                            else:
-                                player_info = trade.get('player') or f"{trade.get('give_player')} <-> {trade.get('get_player')}"
+                            player_info = trade_labels[trade['id']]
                             agreed_tm = "Unknown Time"
                             if trade.get('agreed_at'):
                                 try:
@@ -2667,17 +3361,12 @@ def show_main_app():
                 # === ADMIN PENDING TRADES APPROVAL ===
                 if is_admin:
                     st.subheader("👑 Admin Trade Approvals")
-                    admin_pending = [t for t in room['pending_trades'] if t.get('status') == 'pending_admin']
                     
                     if admin_pending:
                         for trade in admin_pending:
                             with st.container():
                                 trade_id = trade['id']
-                                if trade['type'] == 'Exchange':
-                                    give_list = trade.get('give_players', [trade.get('give_player')] if trade.get('give_player') else [])
-                                    player_info = f"{', '.join(give_list)} ↔ {trade.get('get_player')}"
-                                else:
-                                    player_info = trade.get('player') or f"{trade.get('give_player')} <-> {trade.get('get_player')}"
+                                player_info = trade_labels[trade['id']]
                                 p_val = trade.get('price', 0)
                                 
                                 price_str = f"Price: {p_val}M"
@@ -2697,8 +3386,8 @@ def show_main_app():
                                 c1, c2 = st.columns(2)
                                 if c1.button("✅ Approve", key=f"adm_app_{trade_id}", type="primary"):
                                     # --- RE-VALIDATE & EXECUTE ---
-                                    sender = next((p for p in room.get('participants', []) if p['name'] == trade['from']), None)
-                                    receiver = next((p for p in room.get('participants', []) if p['name'] == trade['to']), None)
+                                    sender = trade_participants_by_name.get(trade['from'])
+                                    receiver = trade_participants_by_name.get(trade['to'])
                                     
                                     success = False
                                     fail_reason = "Unknown Error"
@@ -2716,7 +3405,7 @@ def show_main_app():
                                                 elif p_obj.get('loan_origin'): fail_reason = f"{trade['player']} is on loan."
                                                 elif any(p['name'] == trade['player'] for p in receiver['squad']): fail_reason = f"Buyer already owns {trade['player']}."
                                                 else:
-                                                    sender['squad'].remove(p_obj)
+                                                    drop_from_squad(sender, p_obj)
                                                     p_obj['buy_price'] = t_price
                                                     receiver['squad'].append(p_obj)
                                                     sender['budget'] = float(sender.get('budget', 0)) + t_price
@@ -2732,7 +3421,7 @@ def show_main_app():
                                                 elif p_obj.get('loan_origin'): fail_reason = f"{trade['player']} is on loan."
                                                 elif any(p['name'] == trade['player'] for p in sender['squad']): fail_reason = f"Buyer already owns {trade['player']}."
                                                 else:
-                                                    receiver['squad'].remove(p_obj)
+                                                    drop_from_squad(receiver, p_obj)
                                                     p_obj['buy_price'] = t_price
                                                     sender['squad'].append(p_obj)
                                                     receiver['budget'] = float(receiver.get('budget', 0)) + t_price
@@ -2776,10 +3465,9 @@ def show_main_app():
                                                 else:
                                                     # Execute: move all give players to receiver, get player to sender
                                                     # buy_price is NEVER changed during exchanges
-                                                    for g_obj in give_objs:
-                                                        sender['squad'].remove(g_obj)
-                                                        receiver['squad'].append(g_obj)
-                                                    receiver['squad'].remove(p_get)
+                                                    drop_from_squad(sender, *give_objs)
+                                                    receiver['squad'].extend(give_objs)
+                                                    drop_from_squad(receiver, p_get)
                                                     sender['squad'].append(p_get)
                                                     sender['budget'] = float(sender.get('budget', 0)) - net_cash
                                                     receiver['budget'] = float(receiver.get('budget', 0)) + net_cash
@@ -2789,10 +3477,7 @@ def show_main_app():
                                                 success = False
                                                  
                                         elif t_type in ["Loan Out", "Loan In"]:
-                                             current_gw = 0
-                                             locked_gws = list(room.get('gameweek_squads', {}).keys())
-                                             if locked_gws: current_gw = max([int(gw) for gw in locked_gws])
-                                             return_gw = current_gw + 1
+                                             return_gw = loan_return_gw
                                              
                                              if t_type == "Loan Out":
                                                  pl_name = trade['player']
@@ -2802,7 +3487,7 @@ def show_main_app():
                                                  elif p_obj.get('loan_origin'): fail_reason = f"Cannot loan out {pl_name} (already on loan)."
                                                  elif float(receiver.get('budget',0)) < fee: fail_reason = f"{receiver['name']} insufficient funds."
                                                  else:
-                                                     sender['squad'].remove(p_obj)
+                                                     drop_from_squad(sender, p_obj)
                                                      p_obj['loan_origin'] = sender['name']
                                                      p_obj['loan_expiry_gw'] = return_gw
                                                      receiver['squad'].append(p_obj)
@@ -2817,7 +3502,7 @@ def show_main_app():
                                                  elif p_obj.get('loan_origin'): fail_reason = f"{receiver['name']} cannot loan out {pl_name} (already on loan)."
                                                  elif float(sender.get('budget',0)) < fee: fail_reason = f"{sender['name']} insufficient funds."
                                                  else:
-                                                     receiver['squad'].remove(p_obj)
+                                                     drop_from_squad(receiver, p_obj)
                                                      p_obj['loan_origin'] = receiver['name']
                                                      p_obj['loan_expiry_gw'] = return_gw
                                                      sender['squad'].append(p_obj)
@@ -2873,12 +3558,12 @@ def show_main_app():
                     with st.expander("Show Console"):
                         cols = st.columns(2)
                         with cols[0]:
-                            sender_name = st.selectbox("Sender Team", [p['name'] for p in room.get('participants', [])], key="adm_sender")
+                            sender_name = st.selectbox("Sender Team", participant_names, key="adm_sender")
                         with cols[1]:
-                            receiver_name = st.selectbox("Receiver Team", [p['name'] for p in room.get('participants', []) if p['name'] != sender_name], key="adm_receiver")
+                            receiver_name = st.selectbox("Receiver Team", [n for n in participant_names if n != sender_name], key="adm_receiver")
                         
-                        sender_part = next((p for p in room.get('participants', []) if p['name'] == sender_name), None)
-                        receiver_part = next((p for p in room.get('participants', []) if p['name'] == receiver_name), None)
+                        sender_part = trade_participants_by_name.get(sender_name)
+                        receiver_part = trade_participants_by_name.get(receiver_name)
                         
                         if sender_part and receiver_part:
                             pl_to_move = st.selectbox("Player to Move", [p['name'] for p in sender_part['squad']], key="adm_mv_pl")
@@ -2888,7 +3573,7 @@ def show_main_app():
                                 # Execute
                                 p_obj = next((p for p in sender_part['squad'] if p['name'] == pl_to_move), None)
                                 if p_obj:
-                                    sender_part['squad'].remove(p_obj)
+                                    drop_from_squad(sender_part, p_obj)
                                     receiver_part['squad'].append(p_obj)
                                     
                                     sender_part['budget'] += trade_price
@@ -2961,8 +3646,7 @@ def show_main_app():
                                                     for log_entry in reversed(room.get('trade_log', [])):
                                                         msg = log_entry.get('msg', '')
                                                         if 'Loan' in msg and loan['player'] in msg:
-                                                            import re as _re
-                                                            fee_match = _re.search(r'for \*\*(\d+(?:\.\d+)?)M\*\*', msg)
+                                                            fee_match = re.search(r'for \*\*(\d+(?:\.\d+)?)M\*\*', msg)
                                                             if fee_match:
                                                                 fee_reversed = float(fee_match.group(1))
                                                             break
@@ -2973,7 +3657,7 @@ def show_main_app():
                                                         owner_part['budget'] = float(owner_part.get('budget', 0)) - fee_reversed
 
                                                     # Move player back
-                                                    borrower_part['squad'].remove(p_obj)
+                                                    drop_from_squad(borrower_part, p_obj)
                                                     p_obj.pop('loan_origin', None)
                                                     p_obj.pop('loan_expiry_gw', None)
                                                     owner_part['squad'].append(p_obj)
@@ -3019,15 +3703,23 @@ def show_main_app():
                 
                 if to_p_name:
                     t_type = st.radio("Type", ["Transfer (Buy)", "Transfer (Sell)", "Exchange", "Loan"], horizontal=True, key="tp_type_simple")
+
+                    # Exchange widgets are keyed per partner; drop state left over from other partners
+                    exch_keys = {f"exch_give_multi_{to_p_name}", f"exch_get_{to_p_name}"}
+                    for k in [k for k in st.session_state if k.startswith(("exch_give_multi_", "exch_get_")) and k not in exch_keys]:
+                        del st.session_state[k]
                 
-                    my_part = next((p for p in room.get('participants', []) if p['name'] == my_p_name), None)
-                    their_part = next((p for p in room.get('participants', []) if p['name'] == to_p_name), None)
+                    my_part = trade_participants_by_name.get(my_p_name)
+                    their_part = trade_participants_by_name.get(to_p_name)
                 
                     if my_part and their_part:
+                        my_squad_names = [p['name'] for p in my_part['squad'] if not p.get('loan_origin')]
+                        their_squad_names = [p['name'] for p in their_part['squad'] if not p.get('loan_origin')]
+
                         if t_type == "Transfer (Sell)":
-                            pl = st.selectbox("Player to Sell", [p['name'] for p in my_part['squad'] if not p.get('loan_origin')], key="sell_pl")
+                            pl = st.selectbox("Player to Sell", my_squad_names, key="sell_pl")
                             pr = st.number_input("Selling Price", 1, 500, 10, key="sell_pr")
-                            if st.button("Send Offer"):
+                            if st.button("Send Offer", key=f"send_sell_{my_p_name}_{to_p_name}"):
                                 # Check Duplicate
                                 is_dup = any(t for t in room['pending_trades'] 
                                              if t['from'] == my_p_name and t['to'] == to_p_name 
@@ -3037,19 +3729,15 @@ def show_main_app():
                                 if is_dup:
                                     st.error("Duplicate Proposal: You have already sent this exact offer.")
                                 else:
-                                    room['pending_trades'].append({
-                                        'id': str(uuid_lib.uuid4()), 'from': my_p_name, 'to': to_p_name,
-                                        'type': t_type, 'player': pl, 'price': pr,
-                                        'created_at': get_ist_time().isoformat()
-                                    })
-                                save_auction_data(auction_data)
-                                st.success("Proposal Sent!")
-                                st.rerun()
+                                    room['pending_trades'].append(new_trade_proposal(my_p_name, to_p_name, t_type, player=pl, price=pr))
+                                    save_auction_data(auction_data)
+                                    st.success("Proposal Sent!")
+                                    st.rerun()
 
                         elif t_type == "Transfer (Buy)":
-                            pl = st.selectbox("Player to Buy", [p['name'] for p in their_part['squad'] if not p.get('loan_origin')], key="buy_pl")
+                            pl = st.selectbox("Player to Buy", their_squad_names, key="buy_pl")
                             pr = st.number_input("Offer Price", 1, 500, 10, key="buy_pr")
-                            if st.button("Send Offer"):
+                            if st.button("Send Offer", key=f"send_buy_{my_p_name}_{to_p_name}"):
                                 # Check Duplicate
                                 is_dup = any(t for t in room['pending_trades'] 
                                              if t['from'] == my_p_name and t['to'] == to_p_name 
@@ -3059,23 +3747,18 @@ def show_main_app():
                                 if is_dup:
                                     st.error("Duplicate Proposal: You have already sent this exact offer.")
                                 else:
-                                    room['pending_trades'].append({
-                                        'id': str(uuid_lib.uuid4()), 'from': my_p_name, 'to': to_p_name,
-                                        'type': t_type, 'player': pl, 'price': pr,
-                                        'created_at': get_ist_time().isoformat()
-                                    })
-                                save_auction_data(auction_data)
-                                st.success("Proposal Sent!")
-                                st.rerun()
+                                    room['pending_trades'].append(new_trade_proposal(my_p_name, to_p_name, t_type, player=pl, price=pr))
+                                    save_auction_data(auction_data)
+                                    st.success("Proposal Sent!")
+                                    st.rerun()
                             
                         elif t_type == "Exchange":
                             st.caption("Exchange up to 5 of your players for 1 player from their squad. Player values stay unchanged.")
                             c1, c2 = st.columns(2)
                             with c1:
-                                my_available = [p['name'] for p in my_part['squad'] if not p.get('loan_origin')]
-                                give_players = st.multiselect("You Give (1-5 players)", my_available, max_selections=5, key="exch_give_multi")
+                                give_players = st.multiselect("You Give (1-5 players)", my_squad_names, max_selections=5, key=f"exch_give_multi_{to_p_name}")
                             with c2:
-                                get_pl = st.selectbox("You Get (1 player)", [p['name'] for p in their_part['squad'] if not p.get('loan_origin')], key="exch_get")
+                                get_pl = st.selectbox("You Get (1 player)", their_squad_names, key=f"exch_get_{to_p_name}")
                         
                             cash_dir = st.radio("Cash Adjustment", ["No Cash Involved", "I Pay Them (Extra Cash)", "They Pay Me (Extra Cash)"], horizontal=True)
                         
@@ -3087,7 +3770,7 @@ def show_main_app():
                                 amt = st.number_input("Amount they pay", 1, 500, 10, key="exch_pay_in")
                                 net_cash = -amt
                         
-                            if st.button("Send Exchange Offer"):
+                            if st.button("Send Exchange Offer", key=f"send_exchange_{my_p_name}_{to_p_name}"):
                                 if not give_players:
                                     st.error("Please select at least 1 player to give.")
                                 elif len(give_players) > 5:
@@ -3103,14 +3786,7 @@ def show_main_app():
                                     if is_dup:
                                         st.error("Duplicate Exchange Offer already sent.")
                                     else:
-                                        room['pending_trades'].append({
-                                            'id': str(uuid_lib.uuid4()), 'from': my_p_name, 'to': to_p_name,
-                                            'type': t_type, 
-                                            'give_players': give_players,
-                                            'get_player': get_pl,
-                                            'price': net_cash,
-                                            'created_at': get_ist_time().isoformat()
-                                        })
+                                        room['pending_trades'].append(new_trade_proposal(my_p_name, to_p_name, t_type, give_players=give_players, get_player=get_pl, price=net_cash))
                                         save_auction_data(auction_data)
                                         st.success("Exchange Proposal Sent!")
                                         st.rerun()
@@ -3118,9 +3794,9 @@ def show_main_app():
                         elif t_type == "Loan":
                             loan_dir = st.radio("Direction", ["Loan Out (You Give)", "Loan In (You Get)"], horizontal=True)
                             if loan_dir == "Loan Out (You Give)":
-                                pl = st.selectbox("Player to Loan Out", [p['name'] for p in my_part['squad'] if not p.get('loan_origin')], key="loan_out_pl")
+                                pl = st.selectbox("Player to Loan Out", my_squad_names, key="loan_out_pl")
                                 fee = st.number_input("Loan Fee (They pay you)", 0, 100, 0, key="loan_fee_out")
-                                if st.button("Offer Loan"):
+                                if st.button("Offer Loan", key=f"offer_loan_{my_p_name}_{to_p_name}"):
                                     # Check Duplicate
                                     is_dup = any(t for t in room['pending_trades'] 
                                                  if t['from'] == my_p_name and t['to'] == to_p_name 
@@ -3129,18 +3805,14 @@ def show_main_app():
                                     if is_dup:
                                         st.error("Duplicate Loan Offer already sent.")
                                     else:
-                                        room['pending_trades'].append({
-                                            'id': str(uuid_lib.uuid4()), 'from': my_p_name, 'to': to_p_name,
-                                            'type': "Loan Out", 'player': pl, 'price': fee,
-                                            'created_at': get_ist_time().isoformat()
-                                        })
-                                    save_auction_data(auction_data)
-                                    st.success("Loan Offer Sent!")
-                                    st.rerun()
+                                        room['pending_trades'].append(new_trade_proposal(my_p_name, to_p_name, "Loan Out", player=pl, price=fee))
+                                        save_auction_data(auction_data)
+                                        st.success("Loan Offer Sent!")
+                                        st.rerun()
                             else:
-                                pl = st.selectbox("Player to Loan In", [p['name'] for p in their_part['squad'] if not p.get('loan_origin')], key="loan_in_pl")
+                                pl = st.selectbox("Player to Loan In", their_squad_names, key="loan_in_pl")
                                 fee = st.number_input("Loan Fee (You pay them)", 0, 100, 0, key="loan_fee_in")
-                                if st.button("Request Loan"):
+                                if st.button("Request Loan", key=f"request_loan_{my_p_name}_{to_p_name}"):
                                     # Check Duplicate
                                     is_dup = any(t for t in room['pending_trades'] 
                                                  if t['from'] == my_p_name and t['to'] == to_p_name 
@@ -3149,56 +3821,30 @@ def show_main_app():
                                     if is_dup:
                                         st.error("Duplicate Loan Request already sent.")
                                     else:
-                                        room['pending_trades'].append({
-                                            'id': str(uuid_lib.uuid4()), 'from': my_p_name, 'to': to_p_name,
-                                            'type': "Loan In", 'player': pl, 'price': fee,
-                                            'created_at': get_ist_time().isoformat()
-                                        })
-                                    save_auction_data(auction_data)
-                                    st.success("Loan Request Sent!")
-                                    st.rerun()
+                                        room['pending_trades'].append(new_trade_proposal(my_p_name, to_p_name, "Loan In", player=pl, price=fee))
+                                        save_auction_data(auction_data)
+                                        st.success("Loan Request Sent!")
+                                        st.rerun()
 
             st.divider()
             st.subheader("📜 Global Transaction Log")
             
             trade_log = room.get('trade_log', [])
             if trade_log:
-                # Reverse order to show newest first
-                for log in reversed(trade_log):
-                    st.markdown(f"<small><b>{log['time']}</b>: {log['msg']}</small>", unsafe_allow_html=True)
+                # Newest first; only the most recent entries are rendered, as one element
+                recent_log = trade_log[-TRADE_LOG_DISPLAY_LIMIT:]
+                st.markdown(
+                    "\n\n".join(f"<small><b>{log['time']}</b>: {log['msg']}</small>" for log in reversed(recent_log)),
+                    unsafe_allow_html=True
+                )
+                if len(trade_log) > TRADE_LOG_DISPLAY_LIMIT:
+                    st.caption(f"Showing the latest {TRADE_LOG_DISPLAY_LIMIT} of {len(trade_log)} transactions.")
             else:
                 st.info("No trades executed yet.")
 
         # ================ TAB 3: SQUADS DASHBOARD ================
         with squad_tabs[2]:
-            st.subheader("👤 Squad Dashboard")
-            
-            # Auto-Refresh Toggle
-            if st.button("🔄 Refresh Now"): st.rerun()
-
-            all_squads_data = []
-            for p in room.get('participants', []):
-                for pl in p['squad']:
-                    all_squads_data.append({
-                        'Participant': p['name'],
-                        'Player': pl['name'],
-                        'Role': pl.get('role', 'Unknown'),
-                        'Team': pl.get('team', player_team_lookup.get(pl['name'], 'Unknown')),
-                        'Price': pl.get('buy_price', 0)
-                    })
-            
-            if all_squads_data:
-                df = pd.DataFrame(all_squads_data)
-                c1, c2 = st.columns(2)
-                with c1: sel_p = st.multiselect("Filter by Participant", [p['name'] for p in room.get('participants', [])])
-                with c2: search = st.text_input("Search Player")
-                
-                if sel_p: df = df[df['Participant'].isin(sel_p)]
-                if search: df = df[df['Player'].str.contains(search, case=False)]
-                
-                st.dataframe(df, use_container_width=True, hide_index=True)
-            else:
-                st.info("No squads yet.")
+            render_squad_dashboard_fragment(room_code)
 
 
     elif page == "📅 Schedule & Admin":
@@ -3310,11 +3956,7 @@ def show_main_app():
                             
                             if last_bought_player:
                                 # Determine refund: half price or free
-                                paid_releases = p.get('paid_releases', {})
-                                if isinstance(paid_releases, list):
-                                    used_release = paid_releases[curr_gw] if curr_gw < len(paid_releases) and paid_releases[curr_gw] else False
-                                else:
-                                    used_release = paid_releases.get(str(curr_gw), False) if curr_gw > 0 else False
+                                used_release = used_paid_release(p, curr_gw)
                                 
                                 # GW1: always half price (pre-season unlimited releases apply)
                                 # GW2+: half price if release not used, free if already used
@@ -3374,7 +4016,8 @@ def show_main_app():
                     # Save snapshot
                     snap = {
                         p['name']: {
-                            'squad': [x.copy() for x in p['squad']],
+                            # Deep copy: player dicts may hold nested data that later trades mutate
+                            'squad': _copy.deepcopy(p['squad']),
                             'injury_reserve': p.get('injury_reserve'),
                             'budget': p.get('budget', 0)
                         } 
@@ -3453,29 +4096,14 @@ def show_main_app():
             with st.expander(expander_title):
                 st.caption("Players from knocked-out teams can be released for 50% without counting as your paid release.")
                 
-                if trn_type == 'IPL 2026':
-                    all_teams = ["CSK", "DC", "GT", "KKR", "LSG", "MI", "PBKS", "RCB", "RR", "SRH"]
-                elif trn_type == 'FIFA World Cup 2026':
-                    all_teams = ["Mexico", "South Africa", "Korea Republic", "Czechia",
-                                "Canada", "Bosnia and Herzegovina", "Qatar", "Switzerland",
-                                "Brazil", "Morocco", "Haiti", "Scotland",
-                                "United States", "Paraguay", "Australia", "Türkiye",
-                                "Germany", "Curaçao", "Côte d'Ivoire", "Ecuador",
-                                "Netherlands", "Japan", "Sweden", "Tunisia",
-                                "Belgium", "Egypt", "Iran", "New Zealand",
-                                "Spain", "Cape Verde", "Saudi Arabia", "Uruguay",
-                                "France", "Senegal", "Iraq", "Norway"]
-                else:
-                    all_teams = ["India", "Sri Lanka", "Australia", "England", "South Africa", "New Zealand", 
-                                "Pakistan", "West Indies", "Afghanistan", "USA", "Ireland", 
-                                "Scotland", "Netherlands", "Zimbabwe", "Namibia", "Nepal", 
-                                "Oman", "UAE", "Canada", "Italy"]
+                all_teams = TOURNAMENT_TEAMS.get(trn_type, TOURNAMENT_TEAMS['T20 World Cup'])
                 
                 knocked_out = set(room.get('knocked_out_teams', []))
+                knocked_out_sorted = sorted(knocked_out)
                 active_teams = [t for t in all_teams if t not in knocked_out]
                 
                 if knocked_out:
-                    st.write(f"**Knocked out:** {', '.join(sorted(knocked_out))}")
+                    st.write(f"**Knocked out:** {', '.join(knocked_out_sorted)}")
                 
                 team_to_knockout = st.selectbox("Select team to knockout", active_teams)
                 
@@ -3483,16 +4111,18 @@ def show_main_app():
                 # ... existing columns ...
                 with col1:
                     if st.button("🚫 Knockout Team"):
-                        room.setdefault('knocked_out_teams', []).append(team_to_knockout)
+                        if team_to_knockout and team_to_knockout not in knocked_out:
+                            room.setdefault('knocked_out_teams', []).append(team_to_knockout)
                         save_auction_data(auction_data)
                         st.success(f"{team_to_knockout} marked as knocked out!")
                         st.rerun()
                 
                 with col2:
                     if knocked_out:
-                        team_to_restore = st.selectbox("Restore team", sorted(knocked_out))
+                        team_to_restore = st.selectbox("Restore team", knocked_out_sorted)
                         if st.button("✅ Restore Team"):
-                            room['knocked_out_teams'].remove(team_to_restore)
+                            # Filter rather than remove() so legacy duplicate entries are cleared too
+                            room['knocked_out_teams'] = [t for t in room['knocked_out_teams'] if t != team_to_restore]
                             save_auction_data(auction_data)
                             st.success(f"{team_to_restore} restored!")
                             st.rerun()
@@ -3548,7 +4178,7 @@ def show_main_app():
             with st.expander("👮 Admin: Force Add Player"):
                 st.info("Forcefully add a player to a squad for a specific price. If the player is owned by someone else, they will be moved.")
                 f_part_name = st.selectbox("Select Target Participant", [p['name'] for p in room.get('participants', [])], key="force_part_sel")
-                f_player_name = st.selectbox("Select Player to Add", sorted(player_names), key="force_player_sel")
+                f_player_name = st.selectbox("Select Player to Add", filtered_options(sorted(player_names), "players", "force_player_sel"), key="force_player_sel")
                 f_price = st.number_input("Force Price (M)", value=0, step=1, key="force_price_val")
                 skip_budget = st.checkbox("Skip budget deduction (record price only, don't subtract from budget)", value=False, key="force_skip_budget")
                 
@@ -3672,10 +4302,7 @@ def show_main_app():
                          target_p_obj = next((p for p in room.get('participants', []) if p['name'] == selected_p_to_reset), None)
                          if target_p_obj:
                              paid_releases = target_p_obj.get('paid_releases', {})
-                             if isinstance(paid_releases, list):
-                                 used_paid = paid_releases[curr_gw] if curr_gw < len(paid_releases) and paid_releases[curr_gw] else False
-                             else:
-                                 used_paid = paid_releases.get(str(curr_gw), False) if curr_gw > 0 else False
+                             used_paid = used_paid_release(target_p_obj, curr_gw)
                              
                              st.write(f"Current status for **{selected_p_to_reset}** in **GW {curr_gw}**: {'❌ Paid Release Used' if used_paid else '✅ Paid Release Available'}")
                              
@@ -3716,13 +4343,15 @@ def show_main_app():
                 
                 # Option 1: Set a deadline and open trading
                 st.markdown("**Option 1: Set Deadline & Open Trading**")
-                col_d1, col_d2 = st.columns(2)
-                with col_d1:
-                    new_date = st.date_input("Deadline Date", (get_ist_time() + timedelta(days=1)).date(), key="dl_date")
-                with col_d2:
-                    new_time = st.time_input("Deadline Time", (get_ist_time() + timedelta(hours=2)).time(), key="dl_time")
+                with st.form("set_dl_open_form"):
+                    col_d1, col_d2 = st.columns(2)
+                    with col_d1:
+                        new_date = st.date_input("Deadline Date", (get_ist_time() + timedelta(days=1)).date(), key="dl_date")
+                    with col_d2:
+                        new_time = st.time_input("Deadline Time", (get_ist_time() + timedelta(hours=2)).time(), key="dl_time")
+                    set_deadline_clicked = st.form_submit_button("🟢 Set Deadline & Open Trading", type="primary")
                 
-                if st.button("🟢 Set Deadline & Open Trading", type="primary", key="set_dl_open"):
+                if set_deadline_clicked:
                     final_dt = datetime.combine(new_date, new_time)
                     if final_dt <= get_ist_time():
                         st.error("❌ **Deadline must be in the future!** You cannot set a deadline in the past.")
@@ -3748,13 +4377,15 @@ def show_main_app():
             elif game_phase == 'Elimination Pending':
                 st.warning(f"🚫 **GW{curr_gw_num} is in Elimination Pending mode.** All trading/bidding is frozen. Once eliminations are done, set a deadline to open trading.")
                 
-                col_d1, col_d2 = st.columns(2)
-                with col_d1:
-                    new_date = st.date_input("Deadline Date", (get_ist_time() + timedelta(days=1)).date(), key="dl_date_ep")
-                with col_d2:
-                    new_time = st.time_input("Deadline Time", (get_ist_time() + timedelta(hours=2)).time(), key="dl_time_ep")
+                with st.form("set_dl_ep_form"):
+                    col_d1, col_d2 = st.columns(2)
+                    with col_d1:
+                        new_date = st.date_input("Deadline Date", (get_ist_time() + timedelta(days=1)).date(), key="dl_date_ep")
+                    with col_d2:
+                        new_time = st.time_input("Deadline Time", (get_ist_time() + timedelta(hours=2)).time(), key="dl_time_ep")
+                    set_deadline_clicked = st.form_submit_button("🟢 Set Deadline & Open Trading", type="primary")
                 
-                if st.button("🟢 Set Deadline & Open Trading", type="primary", key="set_dl_ep"):
+                if set_deadline_clicked:
                     final_dt = datetime.combine(new_date, new_time)
                     if final_dt <= get_ist_time():
                         st.error("❌ **Deadline must be in the future!**")
@@ -4086,7 +4717,6 @@ def show_main_app():
                                     })
                             
                             if matches:
-                                import difflib
                                 valid_parts = [p['name'] for p in room.get('participants', [])]
                                 
                                 # Auto-create Shadow Participants
@@ -4181,11 +4811,16 @@ def show_main_app():
                     success = 0
                     db_changed = False
                     new_players_list = list(players_db)
+                    # Local additions: the shared player indexes must not be mutated
+                    known_names = set(player_names)
+                    added_info = {}
                     
                     if 'unsold_players' not in room:
-                        all_owned = [pl['name'] for p in room.get('participants', []) for pl in p['squad']]
+                        all_owned = drafted_player_names(room)
                         room['unsold_players'] = [p for p in player_names if p not in all_owned]
                     
+                    import_participants_by_name, _ = participant_index(room)
+                    imported_names = set()
                     for _, row in edited_df.iterrows():
                         p_curr = row['Participant (Matched)']
                         pl_name = row['Player (DB)']
@@ -4194,7 +4829,7 @@ def show_main_app():
                         pl_name = str(pl_name).strip()
                         
                         # Register in player database if missing
-                        if pl_name not in player_names:
+                        if pl_name not in known_names:
                             new_p_entry = {
                                 "name": pl_name,
                                 "role": "Unknown",
@@ -4202,15 +4837,15 @@ def show_main_app():
                             }
                             new_players_list.append(new_p_entry)
                             db_changed = True
-                            player_names.append(pl_name)
-                            player_info_map[pl_name] = new_p_entry
+                            known_names.add(pl_name)
+                            added_info[pl_name] = new_p_entry
                         
-                        part_obj = next((p for p in room.get('participants', []) if p['name'] == p_curr), None)
+                        part_obj = import_participants_by_name.get(p_curr)
                         if part_obj:
                             # Dedupe
                             if any(x['name'] == pl_name for x in part_obj['squad']): continue
                             
-                            info = player_info_map.get(pl_name, {})
+                            info = added_info.get(pl_name) or player_info_map.get(pl_name, {})
                             part_obj['squad'].append({
                                 'name': pl_name,
                                 'role': info.get('role', 'Unknown'),
@@ -4220,16 +4855,18 @@ def show_main_app():
                             })
                             # part_obj['budget'] -= row['Price'] # REMOVED: We will set absolute budget below
                             
-                            if pl_name in room['unsold_players']:
-                                room['unsold_players'].remove(pl_name)
-                                
+                            imported_names.add(pl_name)
                             success += 1
                     
+                    # Drop imported players from the unsold pool in one pass (order kept)
+                    if imported_names:
+                        room['unsold_players'] = [n for n in room['unsold_players'] if n not in imported_names]
+                    
                     # 4. Apply Extracted Budgets Overrides
                     if 'extracted_budgets' in st.session_state:
                         for p_name, budget in st.session_state.extracted_budgets.items():
                             # Find participant (handle name changes via map could be tricky, but usually name matches)
-                            part = next((p for p in room.get('participants', []) if p['name'] == p_name), None)
+                            part = import_participants_by_name.get(p_name)
                             if part:
                                 part['budget'] = budget
                                 
@@ -4237,6 +4874,9 @@ def show_main_app():
                         try:
                             with open(FIFA_WC_PLAYERS_FILE, 'w') as f:
                                 json.dump(new_players_list, f, indent=4)
+                            load_player_indexes.clear()
+                            load_players_by_team.clear()
+                            load_auction_order_by_team.clear()
                             st.toast(f"Saved {len(new_players_list)} players to database!")
                         except Exception as e:
                             st.error(f"Error saving to player database: {e}")
@@ -4318,7 +4958,7 @@ def show_main_app():
                                  
                                  # 2. Add back to Squad
                                  # Find role/team from DB
-                                 p_db_info = next((p for p in players_db if p['name'] == player_to_reverse), {})
+                                 p_db_info = player_info_map.get(player_to_reverse, {})
                                  
                                  p_obj_rev['squad'].append({
                                      'name': player_to_reverse,
@@ -4404,14 +5044,12 @@ def show_main_app():
                 
                 # Show all users who are members of this room
                 room_members = []
+                _, team_by_user = participant_index(room)
                 for member_username in room.get('members', []):
                     if member_username in auction_data.get('users', {}):
                         # Find their participant/team name if any
-                        participant_name = "No team assigned"
-                        for p in room.get('participants', []):
-                            if p.get('user') == member_username:
-                                participant_name = f"Team: **{p['name']}**"
-                                break
+                        member_team = team_by_user.get(member_username)
+                        participant_name = f"Team: **{member_team['name']}**" if member_team else "No team assigned"
                         room_members.append({"username": member_username, "team": participant_name})
                 
                 if room_members:
@@ -4510,11 +5148,11 @@ def show_main_app():
             
             gameweeks = schedule.get('gameweeks', {})
             if gameweeks:
-                gw_options = [(k, f"GW {k}: {v['name']} ({v['dates']})") for k, v in gameweeks.items()]
+                gw_labels = {k: f"GW {k}: {v['name']} ({v['dates']})" for k, v in gameweeks.items()}
                 selected_gw = st.selectbox(
                     "Select Gameweek",
-                    options=[g[0] for g in gw_options],
-                    format_func=lambda x: next(g[1] for g in gw_options if g[0] == x)
+                    options=list(gw_labels),
+                    format_func=gw_labels.get
                 )
                 
                 if selected_gw:
@@ -4523,13 +5161,7 @@ def show_main_app():
                     
                     # Display matches
                     st.markdown("**Matches in this Gameweek:**")
-                    matches_df = pd.DataFrame(gw_data['matches'])
-                    matches_df['Match'] = matches_df['teams'].apply(lambda x: f"{x[0]} vs {x[1]}")
-                    display_cols = ['match_id', 'Match', 'date']
-                    if 'time' in matches_df.columns:
-                        display_cols.append('time')
-                    display_cols.append('venue')
-                    st.dataframe(matches_df[display_cols], use_container_width=True, hide_index=True)
+                    st.dataframe(load_gameweek_matches_df(active_tournament_type, selected_gw), use_container_width=True, hide_index=True)
                     
                     locked_squads = room.get('gameweek_squads', {}).get(selected_gw, {})
 
@@ -4574,7 +5206,7 @@ def show_main_app():
                         )
                         
                         if st.button(f"🚀 Process Gameweek {selected_gw}", type="primary", key="process_gw_btn"):
-                            urls = [u.strip() for u in urls_input.split('\n') if u.strip()]
+                            urls = parse_match_urls(urls_input)
                             
                             if not urls:
                                 st.error("Please enter at least one match URL.")
@@ -4583,11 +5215,10 @@ def show_main_app():
                                 
                                 if active_tournament_type == 'FIFA World Cup 2026':
                                     # Football scoring pipeline (WhoScored)
-                                    import football_score_calculator
                                     progress = st.progress(0)
                                     status = st.empty()
                                     
-                                    all_scores_nested = {}
+                                    all_scores_nested = defaultdict(Counter)
                                     for i, url in enumerate(urls):
                                         status.text(f"Processing match {i+1}/{len(urls)} via WhoScored...")
                                         try:
@@ -4597,9 +5228,7 @@ def show_main_app():
                                                     name = row['Player']
                                                     pos = row['Position']
                                                     score = int(row['Score'])
-                                                    if name not in all_scores_nested:
-                                                        all_scores_nested[name] = {}
-                                                    all_scores_nested[name][pos] = all_scores_nested[name].get(pos, 0) + score
+                                                    all_scores_nested[name][pos] += score
                                         except Exception as e:
                                             st.warning(f"Error processing {url}: {e}")
                                         
@@ -4608,33 +5237,18 @@ def show_main_app():
                                     # Process nested scores to simple number or dictionary
                                     for name, pos_scores in all_scores_nested.items():
                                         if len(pos_scores) == 1:
-                                            all_scores[name] = list(pos_scores.values())[0]
+                                            all_scores[name] = next(iter(pos_scores.values()))
                                         else:
-                                            all_scores[name] = pos_scores
+                                            all_scores[name] = dict(pos_scores)
 
                                 else:
                                     # Cricket scoring pipeline (Cricbuzz)
-                                    scraper = cricbuzz_scraper.CricbuzzScraper()
-                                    calculator = CricketScoreCalculator()
+                                    scraper = get_cricbuzz_scraper()
+                                    calculator = get_cricket_calculator()
                                     
                                     progress = st.progress(0)
                                     status = st.empty()
-                                
-                                    for i, url in enumerate(urls):
-                                        status.text(f"Processing match {i+1}/{len(urls)}...")
-                                        try:
-                                            players = scraper.fetch_match_data(url)
-                                            for p in players:
-                                                score = calculator.calculate_score(p)
-                                                name = p['name']
-                                                if name in all_scores:
-                                                    all_scores[name] += score
-                                                else:
-                                                    all_scores[name] = score
-                                        except Exception as e:
-                                            st.warning(f"Error processing {url}: {e}")
-                                        
-                                        progress.progress((i + 1) / len(urls))
+                                    all_scores = score_cricbuzz_urls(urls, scraper, calculator, progress, status)
                                 
                                 # Store in room data (shared for both football and cricket)
                                 room.setdefault('gameweek_scores', {})[selected_gw] = all_scores
@@ -4683,9 +5297,13 @@ def show_main_app():
                                 
                                 # Show preview
                                 st.subheader("📊 Scores Preview")
-                                scores_df = pd.DataFrame([{"Player": k, "Points": v} for k, v in all_scores.items()])
-                                scores_df = scores_df.sort_values(by="Points", ascending=False)
-                                st.dataframe(scores_df.head(20), use_container_width=True, hide_index=True)
+                                # Top 20 straight off the dict (ties keep scoring order, like the
+                                # old stable sort); dual-position entries rank by their best score
+                                top_scores = heapq.nlargest(
+                                    20, all_scores.items(),
+                                    key=lambda kv: max(kv[1].values()) if isinstance(kv[1], dict) else kv[1]
+                                )
+                                st.dataframe(pd.DataFrame(top_scores, columns=["Player", "Points"]), use_container_width=True, hide_index=True)
             else:
                 st.warning("Tournament schedule not loaded.")
         
@@ -4702,7 +5320,7 @@ def show_main_app():
                 manual_urls = st.text_area("Match URLs (one per line)", height=200, placeholder=manual_url_placeholder, key="manual_urls")
                 
                 if st.button("🚀 Process", type="primary", key="manual_process_btn"):
-                    urls = [u.strip() for u in manual_urls.split('\n') if u.strip()]
+                    urls = parse_match_urls(manual_urls)
                     
                     if not urls:
                         st.error("Please enter at least one URL.")
@@ -4712,8 +5330,7 @@ def show_main_app():
                         status = st.empty()
                         
                         if active_tournament_type == 'FIFA World Cup 2026':
-                            import football_score_calculator
-                            all_scores_nested = {}
+                            all_scores_nested = defaultdict(Counter)
                             for i, url in enumerate(urls):
                                 status.text(f"Processing match {i+1}/{len(urls)} via WhoScored...")
                                 try:
@@ -4723,9 +5340,7 @@ def show_main_app():
                                             name = row['Player']
                                             pos = row['Position']
                                             score = int(row['Score'])
-                                            if name not in all_scores_nested:
-                                                all_scores_nested[name] = {}
-                                            all_scores_nested[name][pos] = all_scores_nested[name].get(pos, 0) + score
+                                            all_scores_nested[name][pos] += score
                                 except Exception as e:
                                     st.warning(f"Error processing {url}: {e}")
                                 progress.progress((i + 1) / len(urls))
@@ -4733,27 +5348,14 @@ def show_main_app():
                             # Process nested scores to simple number or dictionary
                             for name, pos_scores in all_scores_nested.items():
                                 if len(pos_scores) == 1:
-                                    all_scores[name] = list(pos_scores.values())[0]
+                                    all_scores[name] = next(iter(pos_scores.values()))
                                 else:
-                                    all_scores[name] = pos_scores
+                                    all_scores[name] = dict(pos_scores)
 
                         else:
-                            scraper = cricbuzz_scraper.CricbuzzScraper()
-                            calculator = CricketScoreCalculator()
-                            for i, url in enumerate(urls):
-                                status.text(f"Processing match {i+1}/{len(urls)}...")
-                                try:
-                                    players = scraper.fetch_match_data(url)
-                                    for p in players:
-                                        score = calculator.calculate_score(p)
-                                        name = p['name']
-                                        if name in all_scores:
-                                            all_scores[name] += score
-                                        else:
-                                            all_scores[name] = score
-                                except Exception as e:
-                                    st.warning(f"Error processing {url}: {e}")
-                                progress.progress((i + 1) / len(urls))
+                            scraper = get_cricbuzz_scraper()
+                            calculator = get_cricket_calculator()
+                            all_scores = score_cricbuzz_urls(urls, scraper, calculator, progress, status)
                         
                         room.setdefault('gameweek_scores', {})[str(manual_gw)] = all_scores
                         save_auction_data(auction_data)
@@ -4774,6 +5376,8 @@ def show_main_app():
                 if st.button("🔄 Reset All Gameweek Scores", type="secondary"):
                     room['gameweek_scores'] = {}
                     save_auction_data(auction_data)
+                    _cumulative_totals_cached.clear()
+                    _score_finished_match.clear()  # next processing re-scrapes every URL
                     st.success("All gameweek scores have been reset!")
                     st.rerun()
         else:
@@ -4799,7 +5403,7 @@ def show_main_app():
                     
                     with col1:
                         st.markdown("**Add Hattrick Bonus:**")
-                        player_to_bonus = st.selectbox("Select Player", all_players, key="hattrick_player_select")
+                        player_to_bonus = st.selectbox("Select Player", filtered_options(all_players, "players", "hattrick_player_select"), key="hattrick_player_select")
                         if st.button("➕ Add 20pt Hattrick Bonus", key="add_hattrick_btn"):
                             if player_to_bonus:
                                 gw_bonuses = hattrick_bonuses.setdefault(bonus_gw, {})
@@ -4872,36 +5476,8 @@ def show_main_app():
             if room.get('gameweek_scores'):
                 with st.expander("👀 Preview Knockout Results", expanded=False):
                     # Calculate cumulative standings (only non-eliminated participants)
-                    p_totals = {}
                     active_participants = [p for p in room.get('participants', []) if not p.get('eliminated', False)]
-                    for gw, scores in room.get('gameweek_scores', {}).items():
-                        scores_with_bonus = scores.copy()
-                        hattrick_bonuses = room.get('hattrick_bonuses', {}).get(str(gw), {})
-                        for player, bonus in hattrick_bonuses.items():
-                            scores_with_bonus[player] = scores_with_bonus.get(player, 0) + bonus
-                        
-                        locked_squads = room.get('gameweek_squads', {}).get(str(gw), {})
-                        
-                        for participant in active_participants:
-                            p_name = participant['name']
-                            if p_name not in p_totals:
-                                p_totals[p_name] = 0
-                            
-                            squad_data = locked_squads.get(p_name)
-                            if squad_data:
-                                if isinstance(squad_data, list):
-                                    squad = squad_data
-                                    ir_player = None
-                                else:
-                                    squad = squad_data.get('squad', [])
-                                    ir_player = squad_data.get('injury_reserve')
-                            else:
-                                squad = participant['squad']
-                                ir_player = participant.get('injury_reserve')
-                            
-                            # Use proper best-11 with role constraints for accurate preview
-                            best_11, _ = get_best_11(squad, scores_with_bonus, ir_player, gameweek=gw)
-                            p_totals[p_name] += sum(p_entry['score'] for p_entry in best_11)
+                    p_totals = cumulative_totals(room, active_participants)
                     
                     # Sort by points
                     sorted_participants = sorted(p_totals.items(), key=lambda x: -x[1])
@@ -4942,38 +5518,10 @@ def show_main_app():
                 st.warning("⚠️ **Process Knockout** is irreversible! This will eliminate bottom participants and release their qualifying players.")
                 
                 if st.button(f"🔥 Process {phase_names.get(phase, phase)} Knockout", type="primary"):
-                    # Calculate final standings using the SAME get_best_11 logic
+                    # Calculate final standings using the SAME cumulative_totals
                     # as the standings display to ensure consistent rankings
-                    p_totals = {}
                     active_participants = [p for p in room.get('participants', []) if not p.get('eliminated', False)]
-                    for gw, scores in room.get('gameweek_scores', {}).items():
-                        scores_with_bonus = scores.copy()
-                        hattrick_bonuses = room.get('hattrick_bonuses', {}).get(str(gw), {})
-                        for player, bonus in hattrick_bonuses.items():
-                            scores_with_bonus[player] = scores_with_bonus.get(player, 0) + bonus
-                        
-                        locked_squads = room.get('gameweek_squads', {}).get(str(gw), {})
-                        
-                        for participant in active_participants:
-                            p_name = participant['name']
-                            if p_name not in p_totals:
-                                p_totals[p_name] = 0
-                            
-                            squad_data = locked_squads.get(p_name)
-                            if squad_data:
-                                if isinstance(squad_data, list):
-                                    squad = squad_data
-                                    ir_player = None
-                                else:
-                                    squad = squad_data.get('squad', [])
-                                    ir_player = squad_data.get('injury_reserve')
-                            else:
-                                squad = participant['squad']
-                                ir_player = participant.get('injury_reserve')
-                            
-                            # Use the same get_best_11 function as the standings display
-                            best_11, _ = get_best_11(squad, scores_with_bonus, ir_player, gameweek=gw)
-                            p_totals[p_name] += sum(p_entry['score'] for p_entry in best_11)
+                    p_totals = cumulative_totals(room, active_participants)
                     
                     sorted_participants = sorted(p_totals.items(), key=lambda x: -x[1])
                     
@@ -5131,281 +5679,7 @@ def show_main_app():
     elif page == "🏆 Standings":
         st.title("🏆 League Standings")
         
-        available_gws = list(room.get('gameweek_scores', {}).keys())
-        
-        if not available_gws:
-            st.info("No gameweeks have been processed yet. Go to Schedule & Admin to process matches.")
-        else:
-            view_mode = st.radio("View", ["Overall (Cumulative)", "By Gameweek"], horizontal=True)
-            
-            # Key to use for detailed view (None = current squad)
-            display_gw_key = None
-            
-            if view_mode == "By Gameweek":
-                selected_gw = st.selectbox("Select Gameweek", available_gws)
-                if selected_gw:
-                    display_gw_key = str(selected_gw)
-                
-                gw_scores = room['gameweek_scores'].get(selected_gw, {}).copy()  # Copy to avoid modifying original
-                
-                # Apply hattrick bonuses for this specific gameweek
-                hattrick_bonuses = room.get('hattrick_bonuses', {}).get(str(selected_gw), {})
-                for player, bonus in hattrick_bonuses.items():
-                    existing = gw_scores.get(player, 0)
-                    if isinstance(existing, dict):
-                        gw_scores[player] = {k: v + bonus for k, v in existing.items()}
-                    else:
-                        gw_scores[player] = existing + bonus
-            else:
-                gw_scores = {}
-                for gw, scores in room['gameweek_scores'].items():
-                    # Add base scores (handle dict scores for dual-position players)
-                    for player, score in scores.items():
-                        existing = gw_scores.get(player, 0)
-                        if isinstance(score, dict) and isinstance(existing, dict):
-                            merged = dict(existing)
-                            for k, v in score.items():
-                                merged[k] = merged.get(k, 0) + v
-                            gw_scores[player] = merged
-                        elif isinstance(score, dict):
-                            if existing == 0:
-                                gw_scores[player] = dict(score)
-                            else:
-                                gw_scores[player] = {k: v + existing for k, v in score.items()}
-                        elif isinstance(existing, dict):
-                            gw_scores[player] = {k: v + score for k, v in existing.items()}
-                        else:
-                            gw_scores[player] = existing + score
-                    # Add hattrick bonuses for this GW
-                    hattrick_bonuses = room.get('hattrick_bonuses', {}).get(str(gw), {})
-                    for player, bonus in hattrick_bonuses.items():
-                        existing = gw_scores.get(player, 0)
-                        if isinstance(existing, dict):
-                            gw_scores[player] = {k: v + bonus for k, v in existing.items()}
-                        else:
-                            gw_scores[player] = existing + bonus
-            
-            # get_best_11 is now defined at module level (shared with knockout code)
-            
-            # Calculate standings
-            standings = []
-            
-            if view_mode == "By Gameweek":
-                # === SINGLE GAMEWEEK VIEW ===
-                # Logic: Use locked squad for this GW (if available) or current squad.
-                if selected_gw:
-                    # gw_scores already set above
-                    # Ensure string key for lookup (keys could be int or str)
-                    gw_key = str(selected_gw)
-                    locked_squads = room.get('gameweek_squads', {}).get(gw_key, {})
-                    
-                    # Debug info
-                    squad_source = "🔒 Locked Squads" if locked_squads else "⚠️ Current Squads (no snapshot found)"
-                    st.caption(f"Squad source: {squad_source} | GW key: '{gw_key}' | Available snapshots: {list(room.get('gameweek_squads', {}).keys())}")
-                    
-                    for participant in room.get('participants', []):
-                        p_name = participant['name']
-                        display_name = f"💀 {p_name}" if participant.get('eliminated') else p_name
-                        
-                        # Resolve Squad
-                        squad_data = locked_squads.get(p_name)
-                        if squad_data:
-                            if isinstance(squad_data, list):
-                                squad = squad_data
-                                ir_player = None
-                            else:
-                                squad = squad_data.get('squad', [])
-                                ir_player = squad_data.get('injury_reserve')
-                        else:
-                            squad = participant['squad']
-                            ir_player = participant.get('injury_reserve')
-                        
-                        best_11, warnings = get_best_11(squad, gw_scores, ir_player, gameweek=selected_gw)
-                        total_points = sum(p['score'] for p in best_11)
-                        
-                        standings.append({
-                            "Participant": display_name,
-                            "Points": total_points,
-                            "Best 11": ", ".join([f"{p['name']} ({p['score']:.0f})" for p in best_11[:3]]) + "...",
-                            "Warnings": " ".join(warnings) if warnings else "OK"
-                        })
-
-            else:
-                # === OVERALL CUMULATIVE VIEW ===
-                # Logic: Sum of (Score for GW_i using Squad_Locked_at_GW_i)
-                # Correctly accounts for transfers/loans over time.
-                
-                all_participants = room.get('participants', [])
-                p_totals = {p['name']: 0 for p in all_participants}
-                
-                # Iterate ALL processed gameweeks
-                for gw, scores in room.get('gameweek_scores', {}).items():
-                     locked_squads = room.get('gameweek_squads', {}).get(str(gw), {})
-                     
-                     for participant in all_participants:
-                        p_name = participant['name']
-                        
-                        # Resolve Squad for THIS specific GW
-                        squad_data = locked_squads.get(p_name)
-                        if squad_data:
-                            if isinstance(squad_data, list):
-                                squad = squad_data
-                                ir_player = None
-                            else:
-                                squad = squad_data.get('squad', [])
-                                ir_player = squad_data.get('injury_reserve')
-                        else:
-                            # Fallback: Use current squad if snapshot missing? 
-                            # Better to use current as best-effort than 0.
-                            squad = participant['squad']
-                            ir_player = participant.get('injury_reserve')
-                        
-                        # Apply hattrick bonuses for this specific gameweek
-                        scores_with_bonus = scores.copy()
-                        hattrick_bonuses = room.get('hattrick_bonuses', {}).get(str(gw), {})
-                        for player, bonus in hattrick_bonuses.items():
-                            scores_with_bonus[player] = scores_with_bonus.get(player, 0) + bonus
-                        
-                        best_11, warnings = get_best_11(squad, scores_with_bonus, ir_player, gameweek=gw)
-                        gw_points = sum(p['score'] for p in best_11)
-                        p_totals[p_name] += gw_points
-                        
-                # Build Table
-                for participant in all_participants:
-                    p_name = participant['name']
-                    display_name = f"💀 {p_name}" if participant.get('eliminated') else p_name
-                    total = p_totals[p_name]
-                    
-                    standings.append({
-                        "Participant": display_name,
-                        "Points": total,
-                        "Best 11": "Cumulative Score", 
-                        "Warnings": "OK"
-                    })
-            
-            standings.sort(key=lambda x: x['Points'], reverse=True)
-            
-            if standings:
-                st.subheader("🏆 Current Standings")
-                
-                if len(standings) >= 3:
-                    cols = st.columns(3)
-                    medals = ["🥇", "🥈", "🥉"]
-                    for i, col in enumerate(cols):
-                        with col:
-                            st.metric(
-                                label=f"{medals[i]} {standings[i]['Participant']}",
-                                value=f"{standings[i]['Points']:.0f} pts"
-                            )
-                
-                st.dataframe(pd.DataFrame(standings), use_container_width=True, hide_index=True)
-                
-                st.divider()
-                st.subheader("📋 Detailed Best 11")
-                detail_participant = st.selectbox("View Best 11 for", [p['name'] for p in room.get('participants', [])])
-                detail_p = next((p for p in room.get('participants', []) if p['name'] == detail_participant), None)
-                if detail_p:
-                    # === CUMULATIVE VIEW LOGIC ===
-                    if view_mode == "Overall (Cumulative)":
-                        st.caption("📊 Showing cumulative contribution of players across all gameweeks (using Locked Squads).")
-                        
-                        cumulative_best = {} # name -> {stats}
-                        total_score = 0
-                        
-                        # Iterate all processed GWs sorted
-                        sorted_gws = sorted(room.get('gameweek_scores', {}).keys(), key=lambda x: int(x) if x.isdigit() else x)
-                        
-                        for gw in sorted_gws:
-                            scores = room['gameweek_scores'][gw]
-                            gw_str = str(gw)
-                            
-                            # Get Locked Squad
-                            locked_squads = room.get('gameweek_squads', {}).get(gw_str, {})
-                            squad_data = locked_squads.get(detail_participant)
-                            
-                            if squad_data:
-                                if isinstance(squad_data, list):
-                                    gw_squad = squad_data
-                                    gw_ir = None
-                                else:
-                                    gw_squad = squad_data.get('squad', [])
-                                    gw_ir = squad_data.get('injury_reserve')
-                            else:
-                                # Fallback to current if missing (best effort)
-                                gw_squad = detail_p['squad']
-                                gw_ir = detail_p.get('injury_reserve')
-                            
-                            # Apply Hattrick Bonus for this GW
-                            gw_scores_final = scores.copy()
-                            hattrick_bonuses = room.get('hattrick_bonuses', {}).get(str(gw), {})
-                            for player, bonus in hattrick_bonuses.items():
-                                gw_scores_final[player] = gw_scores_final.get(player, 0) + bonus
-                                
-                            # Calculate Best 11 for this GW
-                            b11, _ = get_best_11(gw_squad, gw_scores_final, gw_ir, gameweek=gw)
-                            
-                            # Aggregate
-                            for p in b11:
-                                name = p['name']
-                                pts = p['score']
-                                total_score += pts
-                                
-                                if name not in cumulative_best:
-                                    cumulative_best[name] = {
-                                        "name": name, 
-                                        "role": p.get('role', 'Unknown'), 
-                                        "category": p.get('category', '?'),
-                                        "score": 0,
-                                        "gameweeks": []
-                                    }
-                                cumulative_best[name]['score'] += pts
-                                cumulative_best[name]['gameweeks'].append(f"GW{gw}({int(pts)})")
-                        
-                        # Convert to List
-                        best_11_data = list(cumulative_best.values())
-                        best_11_data.sort(key=lambda x: x['score'], reverse=True)
-                        
-                        st.markdown(f"**Total Cumulative Score: {int(total_score)}**")
-                        
-                        # Display nicely
-                        if best_11_data:
-                            df = pd.DataFrame(best_11_data)
-                            # Clean up display
-                            df['Breakdown'] = df['gameweeks'].apply(lambda x: ", ".join(x))
-                            st.dataframe(df[['name', 'role', 'score', 'Breakdown']], use_container_width=True, hide_index=True)
-                        else:
-                            st.info("No points scored yet.")
-
-                    # === PER-GAMEWEEK VIEW LOGIC ===
-                    else:
-                        # Use locked squad for this GW if available
-                        locked_squads = room.get('gameweek_squads', {}).get(display_gw_key, {}) if display_gw_key else {}
-                        squad_data = locked_squads.get(detail_participant)
-                        
-                        if squad_data:
-                            if isinstance(squad_data, list):
-                                detail_squad = squad_data
-                                detail_ir = None
-                            else:
-                                detail_squad = squad_data.get('squad', [])
-                                detail_ir = squad_data.get('injury_reserve')
-                        else:
-                            detail_squad = detail_p['squad']
-                            detail_ir = detail_p.get('injury_reserve')
-                        
-                        # Info: show which squad source
-                        if display_gw_key and squad_data:
-                            st.caption(f"🔒 Using Locked Squad from GW {display_gw_key}")
-                        elif display_gw_key:
-                            st.caption(f"⚠️ Using Current Squad (No snapshot found for GW {display_gw_key})")
-                        
-                        best_11, warnings = get_best_11(detail_squad, gw_scores, detail_ir, gameweek=display_gw_key)
-                        if warnings:
-                            for w in warnings: st.warning(w)
-                        best_11_df = pd.DataFrame(best_11)
-                        st.dataframe(best_11_df, use_container_width=True, hide_index=True)
-            else:
-                st.info("No participants have been added yet. Go to Auction Room to add participants.")
+        render_standings_fragment(room_code)
     
     # =====================================
     # PAGE 5: Top Scorers (Player Leaderboard)
@@ -5440,17 +5714,8 @@ def show_main_app():
                             'gw_scores': {selected_scorer_gw: total}
                         }
             else:
-                # Cumulative across all gameweeks
-                for gw, scores in room.get('gameweek_scores', {}).items():
-                    hattrick_bonuses = room.get('hattrick_bonuses', {}).get(str(gw), {})
-                    for player, score in scores.items():
-                        bonus = hattrick_bonuses.get(player, 0)
-                        total = score + bonus
-                        if player not in player_totals:
-                            player_totals[player] = {'score': 0, 'matches': 0, 'gw_scores': {}}
-                        player_totals[player]['score'] += total
-                        player_totals[player]['matches'] += 1
-                        player_totals[player]['gw_scores'][gw] = total
+                # Cumulative across all gameweeks (cached until scores or bonuses change)
+                player_totals = player_season_totals(room)
             
             if player_totals:
                 # Build sorted list
@@ -5476,6 +5741,12 @@ def show_main_app():
                             )
                     st.divider()
                 
+                # Flat player -> owner index (first participant wins, as the old scan did)
+                owner_by_player = {}
+                for participant in room.get('participants', []):
+                    for sp in participant.get('squad', []):
+                        owner_by_player.setdefault(sp.get('name', '').lower(), participant['name'])
+
                 # Build DataFrame
                 table_data = []
                 for rank, (name, data) in enumerate(sorted_players, 1):
@@ -5494,17 +5765,7 @@ def show_main_app():
                             gw_parts.append(f"GW{gw_key}: {data['gw_scores'][gw_key]:.0f}")
                         row["Breakdown"] = " | ".join(gw_parts)
                     
-                    # Find which participant owns this player
-                    owner = "-"
-                    for participant in room.get('participants', []):
-                        squad = participant.get('squad', [])
-                        for sp in squad:
-                            if sp.get('name', '').lower() == name.lower():
-                                owner = participant['name']
-                                break
-                        if owner != "-":
-                            break
-                    row["Owner"] = owner
+                    row["Owner"] = owner_by_player.get(name.lower(), "-")
                     
                     table_data.append(row)
                 
@@ -5596,7 +5857,6 @@ else:
     try:
         show_main_app()
     except Exception as e:
-        import traceback
         st.error(f"⚠️ App Error: {e}")
         st.code(traceback.format_exc(), language="python")
         st.warning("The room encountered an error. Your data is safe. Click below to go back.")
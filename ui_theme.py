@@ -974,9 +974,14 @@ def get_premium_css():
 # ═══════════════════════════════════════════════════════════
 # THEME INJECTION FUNCTION
 # ═══════════════════════════════════════════════════════════
-@st.cache_data
+@st.cache_resource
 def _get_cached_theme_css():
-    """Cache the theme CSS string — it never changes at runtime."""
+    """Cache the theme CSS string — it never changes at runtime.
+
+    cache_resource hands back the same str without cache_data's per-hit
+    unpickle copy. The markdown itself must still be emitted on every rerun:
+    Streamlit drops elements a run doesn't re-render, styles included.
+    """
     return get_premium_css()
 
 def inject_premium_theme():